@@ -1,20 +1,19 @@
 from src.data_collection.fetch_yahoo import fetch_yahoo_data
-from src.preprocessing.returns_calc import compute_returns
+from src.preprocessing.incremental_stats import update_statistics
 from src.optimization.markowitz_optimizer import optimize_portfolio
-from src.allocation.portfolio_profiles import get_profile_constraints
-from src.visualization.reports import generate_report
+from src.visualization.reports import generate_batch_reports
 
 def main():
 
-    data = fetch_yahoo_data(start="2015-01-01")
-    
-    returns, stats = compute_returns(data)
-    
+    fetch_yahoo_data(start="2015-01-01")
+
+    update_statistics()
+
+    carteiras = {}
     for perfil in ["Conservador", "Moderado", "Arrojado"]:
-        constraints = get_profile_constraints(perfil)
-        carteira = optimize_portfolio(returns, stats, constraints)
-        generate_report(carteira, perfil)
-    
+        carteiras[perfil] = optimize_portfolio(perfil)
+    generate_batch_reports(carteiras)
+
     print("Carteiras geradas ")
 
 if __name__ == "__main__":
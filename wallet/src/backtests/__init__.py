@@ -1 +1,4 @@
-from .simulator import PortfolioBacktester
\ No newline at end of file
+from .simulator import PortfolioBacktester
+from .metrics import PerformanceMetrics
+from .risk_free import RiskFreeRate, load_cdi
+from .event_log import RebalanceLog
\ No newline at end of file
@@ -0,0 +1,181 @@
+from typing import Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class RebalanceLog:
+    """
+    Histórico de rebalanceamentos em formato colunar (um array NumPy por campo).
+
+    Cada evento registra data, id da carteira, pesos antes e depois, capital,
+    turnover e custo. Os arrays são pré-alocados e crescem por duplicação, de
+    modo que `append` não cria objetos Python por evento. Para compatibilidade,
+    `log[i]`, `log[a:b]` e a iteração devolvem dicionários no formato antigo
+    ({'date', 'event', 'weights_before', 'capital_before', ...}).
+
+    Datas com fuso são guardadas em UTC (sem fuso) e o fuso do primeiro
+    evento é reaplicado na leitura.
+    """
+
+    SCALAR_FIELDS = {
+        "date": "datetime64[ns]",
+        "portfolio_id": "int32",
+        "capital_before": "float64",
+        "turnover": "float64",
+        "cost": "float64",
+    }
+
+    def __init__(self, assets: Sequence[str], capacity: int = 64):
+        self.assets = list(assets)
+        self.tz = None
+        self._size = 0
+        self._allocate(max(int(capacity), 1))
+
+    def _allocate(self, capacity: int) -> None:
+        n = len(self.assets)
+        columns = {name: np.empty(capacity, dtype=dt) for name, dt in self.SCALAR_FIELDS.items()}
+        columns["weights_before"] = np.empty((capacity, n), dtype="float64")
+        columns["weights_after"] = np.empty((capacity, n), dtype="float64")
+        if self._size:
+            for name, arr in columns.items():
+                arr[:self._size] = self._columns[name][:self._size]
+        self._columns = columns
+        self._capacity = capacity
+
+    def append(
+        self,
+        date,
+        weights_before: np.ndarray,
+        weights_after: np.ndarray,
+        capital_before: float,
+        turnover: float = 0.0,
+        cost: float = 0.0,
+        portfolio_id: int = 0,
+    ) -> None:
+        """Registra um evento. Pesos seguem a ordem de `self.assets`."""
+        if self._size == self._capacity:
+            self._allocate(self._capacity * 2)
+        i = self._size
+        c = self._columns
+        date = pd.Timestamp(date)
+        if i == 0:
+            self.tz = date.tz
+        elif (date.tz is None) != (self.tz is None):
+            raise ValueError("Datas com e sem fuso horário no mesmo histórico.")
+        if date.tz is not None:
+            date = date.tz_convert(None)
+        c["date"][i] = date.to_datetime64()
+        c["portfolio_id"][i] = portfolio_id
+        c["capital_before"][i] = capital_before
+        c["turnover"][i] = turnover
+        c["cost"][i] = cost
+        c["weights_before"][i] = weights_before
+        c["weights_after"][i] = weights_after
+        self._size = i + 1
+
+    # ------------------------------------------------------------
+    # Acesso colunar
+    # ------------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """View (sem cópia) de uma coluna com os eventos registrados."""
+        return self._columns[name][:self._size]
+
+    def dates(self) -> pd.DatetimeIndex:
+        """Datas dos eventos, no fuso original."""
+        index = pd.DatetimeIndex(self.column("date"))
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else index
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ------------------------------------------------------------
+    # Visão de dicionários (compatibilidade com a lista antiga)
+    # ------------------------------------------------------------
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("índice fora do histórico de rebalanceamentos")
+        c = self._columns
+        date = pd.Timestamp(c["date"][i])
+        if self.tz is not None:
+            date = date.tz_localize("UTC").tz_convert(self.tz)
+        return {
+            "date": date,
+            "event": "rebalance",
+            "portfolio_id": int(c["portfolio_id"][i]),
+            "weights_before": dict(zip(self.assets, c["weights_before"][i].tolist())),
+            "weights_after": dict(zip(self.assets, c["weights_after"][i].tolist())),
+            "capital_before": float(c["capital_before"][i]),
+            "turnover": float(c["turnover"][i]),
+            "cost": float(c["cost"][i]),
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self[i] for i in range(self._size))
+
+    def to_dicts(self) -> List[Dict]:
+        return list(self)
+
+    # ------------------------------------------------------------
+    # Exportação
+    # ------------------------------------------------------------
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame largo: colunas escalares + before_<ativo> / after_<ativo>."""
+        data = {name: self.column(name) for name in self.SCALAR_FIELDS}
+        data["date"] = self.dates()
+        for prefix, name in (("before", "weights_before"), ("after", "weights_after")):
+            weights = self.column(name)
+            for j, asset in enumerate(self.assets):
+                data[f"{prefix}_{asset}"] = weights[:, j]
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        """
+        Tabela Arrow que reaproveita os buffers NumPy (sem cópia para colunas
+        numéricas). Pesos viram listas de tamanho fixo na ordem de `assets`.
+        """
+        import pyarrow as pa
+
+        n = len(self.assets)
+        arrays = [pa.array(self.column(name)) for name in self.SCALAR_FIELDS]
+        if self.tz is not None:
+            arrays[0] = pa.array(self.column("date"), type=pa.timestamp("ns", tz=str(self.tz)))
+        names = list(self.SCALAR_FIELDS)
+        for name in ("weights_before", "weights_after"):
+            flat = pa.array(self.column(name).reshape(-1))
+            arrays.append(pa.FixedSizeListArray.from_arrays(flat, n))
+            names.append(name)
+        metadata = {b"assets": ",".join(self.assets).encode("utf-8")}
+        return pa.Table.from_arrays(arrays, names=names, metadata=metadata)
+
+    def to_parquet(self, path: str) -> str:
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
+        return path
+
+    @classmethod
+    def concat(cls, logs: Sequence["RebalanceLog"]) -> "RebalanceLog":
+        """Junta históricos (ex: várias carteiras de um batch) com os mesmos ativos."""
+        if not logs:
+            raise ValueError("Nenhum histórico para concatenar.")
+        assets = logs[0].assets
+        if any(log.assets != assets for log in logs):
+            raise ValueError("Todos os históricos devem ter os mesmos ativos, na mesma ordem.")
+        zones = {str(log.tz) for log in logs if len(log)}
+        if len(zones) > 1:
+            raise ValueError(f"Históricos com fusos horários diferentes: {sorted(zones)}")
+        total = sum(len(log) for log in logs)
+        out = cls(assets, capacity=total)
+        out.tz = next((log.tz for log in logs if len(log)), None)
+        for name in out._columns:
+            out._columns[name][:total] = np.concatenate([log.column(name) for log in logs])
+        out._size = total
+        return out
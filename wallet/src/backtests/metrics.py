@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
+from .risk_free import RiskFreeRate, align_risk_free
+from src.preprocessing import frequency
 
 
 class PerformanceMetrics:
@@ -8,36 +10,52 @@ class PerformanceMetrics:
     Calcula métricas de performance e risco para backtests de carteiras.
     """
 
-    def __init__(self, equity_curve: pd.Series, benchmark: Optional[pd.Series] = None, risk_free: float = 0.0):
+    def __init__(
+        self,
+        equity_curve: pd.Series,
+        benchmark: Optional[pd.Series] = None,
+        risk_free: Union[float, pd.Series, RiskFreeRate] = 0.0,
+        periods_per_year: Optional[float] = None
+    ):
         """
         equity_curve: Série temporal do valor acumulado da carteira (ex: 1.0 → 1.25).
         benchmark: Série temporal do índice de referência (opcional).
-        risk_free: Taxa livre de risco anual (ex: CDI = 0.11 = 11% a.a.).
+        risk_free: Taxa livre de risco. Aceita uma taxa anual constante
+            (ex: CDI = 0.11 = 11% a.a.), uma série de taxas diárias ou um
+            RiskFreeRate (ex: load_cdi()), cujo alinhamento fica em cache.
+        periods_per_year: períodos por ano usados na anualização (252 diário,
+            12 mensal...). Se omitido, vem de equity_curve.attrs ou é inferido do índice.
         """
         self.equity = equity_curve.dropna()
+        self.periods_per_year = periods_per_year or frequency.periods_per_year(equity_curve)
         self.benchmark = benchmark
         self.rf = risk_free
         self.returns = self.equity.pct_change().dropna()
 
+        rf_returns = align_risk_free(risk_free, self.equity.index, self.periods_per_year)
+        self.rf_returns = rf_returns.reindex(self.returns.index).fillna(0.0)
+        self.excess_returns = self.returns - self.rf_returns
+        self._active = None
+
     def total_return(self) -> float:
         return self.equity.iloc[-1] / self.equity.iloc[0] - 1
 
     def annualized_return(self) -> float:
-        days = (self.equity.index[-1] - self.equity.index[0]).days
-        return (1 + self.total_return()) ** (252 / days) - 1
+        n_periods = len(self.equity) - 1
+        return (1 + self.total_return()) ** (self.periods_per_year / n_periods) - 1
 
     def annualized_volatility(self) -> float:
-        return self.returns.std() * np.sqrt(252)
+        return self.returns.std() * np.sqrt(self.periods_per_year)
 
     def sharpe_ratio(self) -> float:
-        excess_ret = self.annualized_return() - self.rf
-        vol = self.annualized_volatility()
-        return excess_ret / vol if vol > 0 else np.nan
+        excess = self.excess_returns.to_numpy()
+        vol = excess.std(ddof=1) * np.sqrt(self.periods_per_year) if len(excess) > 1 else np.nan
+        return excess.mean() * self.periods_per_year / vol if vol > 0 else np.nan
 
     def sortino_ratio(self) -> float:
-        downside = self.returns[self.returns < 0].std() * np.sqrt(252)
-        excess_ret = self.annualized_return() - self.rf
-        return excess_ret / downside if downside > 0 else np.nan
+        excess = self.excess_returns.to_numpy()
+        downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2)) * np.sqrt(self.periods_per_year)
+        return excess.mean() * self.periods_per_year / downside if downside > 0 else np.nan
 
     def max_drawdown(self) -> float:
         roll_max = self.equity.cummax()
@@ -48,13 +66,20 @@ class PerformanceMetrics:
         mdd = abs(self.max_drawdown())
         return self.annualized_return() / mdd if mdd > 0 else np.nan
 
+    def _aligned_benchmark(self) -> pd.DataFrame:
+        """Retornos da carteira e do benchmark nas datas comuns (calculado uma vez)."""
+        if self._active is None:
+            aligned = pd.concat([self.returns, self.benchmark.pct_change().dropna()], axis=1).dropna()
+            aligned.columns = ["portfolio", "benchmark"]
+            self._active = aligned
+        return self._active
+
     def tracking_error(self) -> float:
         if self.benchmark is None:
             return np.nan
-        aligned = pd.concat([self.returns, self.benchmark.pct_change().dropna()], axis=1).dropna()
-        aligned.columns = ["portfolio", "benchmark"]
+        aligned = self._aligned_benchmark()
         diff = aligned["portfolio"] - aligned["benchmark"]
-        return diff.std() * np.sqrt(252)
+        return diff.std() * np.sqrt(self.periods_per_year)
 
     def information_ratio(self) -> float:
         if self.benchmark is None:
@@ -62,15 +87,16 @@ class PerformanceMetrics:
         te = self.tracking_error()
         if te == 0 or np.isnan(te):
             return np.nan
-        active_ret = self.annualized_return() - self.benchmark.pct_change().mean() * 252
+        aligned = self._aligned_benchmark()
+        active_ret = (aligned["portfolio"] - aligned["benchmark"]).mean() * self.periods_per_year
         return active_ret / te
 
     def beta(self) -> float:
         if self.benchmark is None:
             return np.nan
-        aligned = pd.concat([self.returns, self.benchmark.pct_change().dropna()], axis=1).dropna()
+        aligned = self._aligned_benchmark()
         cov = np.cov(aligned["portfolio"], aligned["benchmark"])[0, 1]
-        var = np.var(aligned["benchmark"])
+        var = np.var(aligned["benchmark"], ddof=1)
         return cov / var if var > 0 else np.nan
 
     def summary(self) -> Dict[str, float]:
@@ -1,83 +1,112 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, Optional, Sequence, Union
+from .event_log import RebalanceLog
+from .schedule import rebalance_mask
+from src.preprocessing.alignment import AlignedPanel, align_prices
+
+
+TRIGGERS = ("either", "calendar", "band", "hybrid")
 
 
 def apply_rebalance(
-    prices: pd.DataFrame,
+    prices: Union[pd.DataFrame, AlignedPanel],
     weights: Dict[str, float],
     threshold: float = 0.05,
-    frequency: str = "M"
-) -> Tuple[pd.Series, List[Dict]]:
+    frequency: Union[str, Sequence, None] = "M",
+    calendar: Optional[str] = None,
+    trigger: str = "either",
+    transaction_cost: float = 0.0,
+    portfolio_id: int = 0
+) -> Tuple[pd.Series, RebalanceLog]:
     """
     Simula o rebalanceamento da carteira com base em drift de pesos
     ou periodicidade fixa.
 
     Parameters
     ----------
-    prices : pd.DataFrame
-        DataFrame com preços ajustados dos ativos.
+    prices : pd.DataFrame ou AlignedPanel
+        Preços ajustados dos ativos. Só os ativos com peso entram na simulação,
+        a partir da primeira data em que todos eles têm preço.
     weights : dict
         Pesos-alvo iniciais da carteira (ex: {'BTC-USD': 0.3, 'IMAB11.SA': 0.7}).
     threshold : float, optional
         Banda de tolerância para desvio de peso (default = 0.05 → ±5%).
-    frequency : str, optional
-        Frequência de rebalanceamento (default = 'M' → mensal).
+    frequency : str, sequence ou None, optional
+        Frequência de rebalanceamento por calendário: 'D'/'B', 'W', 'M', 'Q',
+        'Y' (fim de período), lista de datas específicas ou None
+        (default = 'M' → último dia útil de cada mês).
+    calendar : str, optional
+        Calendário de dias úteis usado nas datas de rebalanceamento
+        ('B3', 'B' ou None → todas as datas do índice).
+    trigger : str, optional
+        Regra de disparo: 'either' (calendário ou banda, default), 'calendar'
+        (só calendário), 'band' (só banda) ou 'hybrid' (banda verificada
+        apenas nas datas do calendário).
+    transaction_cost : float, optional
+        Custo por unidade de capital negociado (ex: 0.001 → 10 bps), descontado
+        do capital a cada rebalanceamento (default = 0).
+    portfolio_id : int, optional
+        Identificador gravado no histórico (útil em simulações em lote).
 
     Returns
     -------
     portfolio_value : pd.Series
-        Série temporal com valor acumulado da carteira.
-    log : list
-        Lista de dicionários com histórico de rebalanceamentos.
+        Série temporal com valor acumulado da carteira (capital inicial 1.0,
+        já com o retorno do primeiro período).
+    log : RebalanceLog
+        Histórico colunar de rebalanceamentos (log[i] devolve um dicionário).
     """
+    if trigger not in TRIGGERS:
+        raise ValueError(f"Regra de disparo desconhecida: {trigger} (use {TRIGGERS})")
 
-    returns = prices.pct_change().dropna()
-    dates = returns.index
     assets = list(weights.keys())
-    log = []
+    panel = prices if isinstance(prices, AlignedPanel) else align_prices(prices)
+    returns = panel.held_returns(assets)
+    dates = returns.index
+    log = RebalanceLog(assets)
 
-    # valores iniciais
-    portfolio_value = pd.Series(index=dates, dtype=float)
-    current_weights = weights.copy()
-    capital = 1.0
-    capital_alloc = {a: capital * w for a, w in current_weights.items()}
+    # datas de calendário pré-calculadas antes da simulação
+    on_calendar = rebalance_mask(dates, frequency, calendar) if trigger != "band" \
+        else np.zeros(len(dates), dtype=bool)
+    check_band = trigger != "calendar"
+
+    growth = 1 + returns.to_numpy(dtype=float)
+    target = np.array([weights[a] for a in assets], dtype=float)
 
-    last_rebalance = dates[0]
-    portfolio_value.iloc[0] = capital
+    # valores iniciais (na data anterior ao primeiro retorno)
+    values = np.empty(len(dates), dtype=float)
+    capital = 1.0
+    capital_alloc = capital * target
 
-    for i, date in enumerate(dates[1:], start=1):
+    for i in range(len(dates)):
         # atualiza capital de cada ativo
-        for a in assets:
-            capital_alloc[a] *= (1 + returns.loc[date, a])
-        capital = sum(capital_alloc.values())
-        portfolio_value.iloc[i] = capital
-
-        # cálculo dos pesos atuais
-        current_alloc = {a: capital_alloc[a] / capital for a in assets}
-
-        # check rebalanceamento por tempo
-        time_to_rebalance = (date - last_rebalance).days >= pd.Timedelta(f"30D").days \
-            if frequency == "M" else False
-
-        # check rebalanceamento por drift
-        drift_detected = any(
-            abs(current_alloc[a] - weights[a]) > threshold for a in assets
-        )
-
-        if drift_detected or time_to_rebalance:
-            log.append({
-                "date": date,
-                "event": "rebalance",
-                "weights_before": current_alloc.copy(),
-                "capital_before": capital,
-            })
-
-            # rebalanceia aos pesos originais
-            for a in assets:
-                capital_alloc[a] = capital * weights[a]
-
-            last_rebalance = date
-
-    portfolio_value.ffill(inplace=True)
+        capital_alloc *= growth[i]
+        capital = capital_alloc.sum()
+        values[i] = capital
+
+        if trigger == "hybrid" and not on_calendar[i]:
+            continue
+
+        # cálculo dos pesos atuais e check de drift
+        current_alloc = capital_alloc / capital
+        drift_detected = check_band and np.abs(current_alloc - target).max() > threshold
+
+        if trigger == "hybrid":
+            do_rebalance = drift_detected
+        else:
+            do_rebalance = drift_detected or on_calendar[i]
+
+        if do_rebalance:
+            # turnover = fração do capital negociada (compras + vendas)
+            turnover = np.abs(target - current_alloc).sum()
+            cost = capital * turnover * transaction_cost
+            log.append(dates[i], current_alloc, target, capital, turnover, cost, portfolio_id)
+
+            # rebalanceia aos pesos originais, descontando o custo
+            capital -= cost
+            values[i] = capital
+            capital_alloc = capital * target
+
+    portfolio_value = pd.Series(values, index=dates)
     return portfolio_value, log
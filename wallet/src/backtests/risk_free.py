@@ -0,0 +1,113 @@
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .schedule import _wall_clock
+
+CDI_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "raw", "cdi.csv"))
+
+
+def _index_key(index: pd.DatetimeIndex) -> tuple:
+    """Chave barata e estável para um índice de datas (usada no cache de alinhamento)."""
+    values = index.asi8
+    if len(values) == 0:
+        return (0,)
+    return (str(index.dtype), len(values), int(values[0]), int(values[-1]), hash(values.tobytes()))
+
+
+class RiskFreeRate:
+    """
+    Taxa livre de risco variável no tempo (ex: CDI diário publicado pelo BCB).
+
+    `rates` contém a taxa diária em decimal (0.0005 = 0.05% a.d.), indexada
+    pela data a partir da qual ela vigora. O alinhamento a um índice de curva
+    de capital é feito uma única vez por índice e mantido em cache, de modo
+    que avaliar várias curvas contra o mesmo CDI não refaz o join.
+    """
+
+    def __init__(self, rates: pd.Series, cache_size: int = 32):
+        rates = pd.Series(rates, dtype=float).dropna().sort_index()
+        rates.index = _wall_clock(rates.index)
+        self.rates = rates
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, pd.Series]" = OrderedDict()
+
+    def period_returns(self, index: pd.DatetimeIndex) -> pd.Series:
+        """
+        Retorno livre de risco de cada período do índice.
+
+        Para o período (t-1, t], usa a taxa vigente em t-1 (sem olhar o futuro)
+        composta pelo número de dias úteis entre as datas. A série resultante é
+        indexada por index[1:], como `equity.pct_change().dropna()`. Períodos
+        anteriores à primeira observação da taxa recebem 0. Índices com fuso
+        são comparados pela data local (o CDI é diário, sem fuso).
+        """
+        index = pd.DatetimeIndex(index)
+        key = _index_key(index)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        local = _wall_clock(index)
+        start, stop = local[:-1], local[1:]
+        pos = self.rates.index.searchsorted(start, side="right") - 1
+        rate = np.where(pos >= 0, self.rates.to_numpy()[np.clip(pos, 0, None)], 0.0)
+        bdays = np.busday_count(
+            start.values.astype("datetime64[D]"), stop.values.astype("datetime64[D]")
+        )
+        rf = pd.Series(np.power(1 + rate, bdays) - 1, index=index[1:], name="risk_free")
+
+        self._cache[key] = rf
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rf
+
+
+_CDI_CACHE: Dict[Tuple, RiskFreeRate] = {}
+
+
+def load_cdi(path: Optional[str] = None) -> RiskFreeRate:
+    """
+    Carrega o CDI salvo por fetch_cdi (data/raw/cdi.csv) como RiskFreeRate compartilhado.
+
+    O resultado fica em cache enquanto o arquivo não for modificado.
+    """
+    path = os.path.abspath(path or CDI_PATH)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo do CDI não encontrado: {path}")
+
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    rate = _CDI_CACHE.get(key)
+    if rate is None:
+        cdi = pd.read_csv(path, index_col=0, parse_dates=True)
+        rate = RiskFreeRate(cdi["valor"])
+        # mantém apenas a versão mais recente de cada arquivo
+        for old in [k for k in _CDI_CACHE if k[0] == path]:
+            del _CDI_CACHE[old]
+        _CDI_CACHE[key] = rate
+    return rate
+
+
+def align_risk_free(
+    risk_free: Union[float, pd.Series, RiskFreeRate],
+    index: pd.DatetimeIndex,
+    periods_per_year: int = 252,
+) -> pd.Series:
+    """
+    Converte a taxa livre de risco para retornos por período alinhados a index[1:].
+
+    risk_free pode ser uma taxa anual constante (float), uma série de taxas
+    diárias ou um RiskFreeRate (recomendado para reaproveitar o cache).
+    """
+    index = pd.DatetimeIndex(index)
+    if isinstance(risk_free, RiskFreeRate):
+        return risk_free.period_returns(index)
+    if isinstance(risk_free, pd.Series):
+        return RiskFreeRate(risk_free).period_returns(index)
+    per_period = (1 + float(risk_free)) ** (1 / periods_per_year) - 1
+    return pd.Series(per_period, index=index[1:], name="risk_free")
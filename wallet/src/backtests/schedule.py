@@ -0,0 +1,153 @@
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Frequências suportadas → regra de período do pandas
+PERIOD_RULES = {
+    "W": "W",
+    "M": "M",
+    "Q": "Q",
+    "Y": "Y",
+}
+
+
+def _easter(year: int) -> date:
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+@lru_cache(maxsize=None)
+def b3_holidays(year: int) -> tuple:
+    """Feriados sem pregão na B3 em um ano (nacionais, Carnaval, Corpus Christi, 24/12 e 31/12)."""
+    easter = _easter(year)
+    days = [
+        date(year, 1, 1),                  # Confraternização Universal
+        easter - timedelta(days=48),       # Carnaval (segunda)
+        easter - timedelta(days=47),       # Carnaval (terça)
+        easter - timedelta(days=2),        # Sexta-feira Santa
+        date(year, 4, 21),                 # Tiradentes
+        date(year, 5, 1),                  # Dia do Trabalho
+        easter + timedelta(days=60),       # Corpus Christi
+        date(year, 9, 7),                  # Independência
+        date(year, 10, 12),                # Nossa Senhora Aparecida
+        date(year, 11, 2),                 # Finados
+        date(year, 11, 15),                # Proclamação da República
+        date(year, 12, 24),                # Véspera de Natal
+        date(year, 12, 25),                # Natal
+        date(year, 12, 31),                # Último dia do ano
+    ]
+    if year >= 2024:
+        days.append(date(year, 11, 20))    # Dia Nacional de Zumbi e da Consciência Negra
+    return tuple(sorted(days))
+
+
+def b3_calendar(start, end) -> np.busdaycalendar:
+    """Calendário de dias úteis da B3 entre start e end."""
+    years = range(pd.Timestamp(start).year, pd.Timestamp(end).year + 1)
+    holidays = [d for y in years for d in b3_holidays(y)]
+    return np.busdaycalendar(holidays=np.array(holidays, dtype="datetime64[D]"))
+
+
+def _wall_clock(index) -> pd.DatetimeIndex:
+    """Datas no horário local do próprio fuso (sem fuso), para comparar com dias de calendário."""
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def business_day_mask(index: pd.DatetimeIndex, calendar: Optional[str] = None) -> np.ndarray:
+    """
+    Máscara booleana das datas do índice que são dias úteis no calendário.
+
+    calendar: 'B3' (pregões da B3), 'B' (segunda a sexta) ou None (todas as datas).
+    """
+    index = _wall_clock(index)
+    if calendar is None or len(index) == 0:
+        return np.ones(len(index), dtype=bool)
+    days = index.values.astype("datetime64[D]")
+    if calendar == "B":
+        return np.is_busday(days)
+    if calendar == "B3":
+        return np.is_busday(days, busdaycal=b3_calendar(index[0], index[-1]))
+    raise ValueError(f"Calendário desconhecido: {calendar}")
+
+
+def rebalance_positions(
+    index: pd.DatetimeIndex,
+    frequency: Union[str, Sequence, None] = "M",
+    calendar: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Pré-calcula as posições (inteiros) do índice em que há rebalanceamento por calendário.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+        Datas da simulação.
+    frequency : str, sequence ou None
+        'D'/'B' → todo dia útil; 'W', 'M', 'Q', 'Y' → último dia útil de cada
+        semana, mês, trimestre ou ano; lista de datas → primeiro dia útil em ou
+        após cada data; None → nenhuma data de calendário.
+    calendar : str, optional
+        Calendário de dias úteis ('B3', 'B' ou None). Datas fora do calendário
+        (ex: fins de semana em séries de cripto) nunca são datas de rebalanceamento.
+
+    Returns
+    -------
+    np.ndarray
+        Posições ordenadas em `index`. O fim de período só é reconhecido quando
+        há uma data posterior no índice, logo o último período (incompleto) não
+        gera rebalanceamento.
+    """
+    tz = pd.DatetimeIndex(index).tz
+    index = _wall_clock(index)
+    if frequency is None or len(index) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    eligible = np.flatnonzero(business_day_mask(index, calendar))
+    if len(eligible) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if not isinstance(frequency, str):
+        targets = pd.DatetimeIndex(pd.to_datetime(list(frequency)))
+        if targets.tz is not None:
+            targets = _wall_clock(targets.tz_convert(tz) if tz is not None else targets)
+        targets = targets.sort_values()
+        pos = index[eligible].searchsorted(targets, side="left")
+        pos = np.unique(pos[pos < len(eligible)])
+        return eligible[pos].astype(np.int64)
+
+    freq = frequency.upper()
+    if freq in ("D", "B"):
+        return eligible.astype(np.int64)
+    if freq not in PERIOD_RULES:
+        raise ValueError(f"Frequência de rebalanceamento desconhecida: {frequency}")
+
+    # Último dia útil de cada período: o período muda em relação à próxima data elegível
+    periods = index[eligible].to_period(PERIOD_RULES[freq]).asi8
+    is_end = periods[:-1] != periods[1:]
+    return eligible[:-1][is_end].astype(np.int64)
+
+
+def rebalance_mask(
+    index: pd.DatetimeIndex,
+    frequency: Union[str, Sequence, None] = "M",
+    calendar: Optional[str] = None,
+) -> np.ndarray:
+    """Versão booleana de rebalance_positions (True nas datas de rebalanceamento)."""
+    mask = np.zeros(len(index), dtype=bool)
+    mask[rebalance_positions(index, frequency, calendar)] = True
+    return mask
@@ -1,7 +1,12 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, Optional, Sequence, Union
+from .event_log import RebalanceLog
+from .metrics import PerformanceMetrics
 from .rebalance import apply_rebalance
+from .risk_free import RiskFreeRate
+from src.preprocessing.alignment import AlignedPanel, align_prices
+from src.preprocessing.frequency import annotate_frequency, periods_per_year
 
 
 class PortfolioBacktester:
@@ -11,48 +16,91 @@ class PortfolioBacktester:
         weights: Dict[str, float],
         rebalance: bool = False,
         rebalance_threshold: float = 0.05,
-        rebalance_frequency: str = "M"
+        rebalance_frequency: Union[str, Sequence, None] = "M",
+        rebalance_calendar: Optional[str] = None,
+        rebalance_trigger: str = "either",
+        transaction_cost: float = 0.0,
+        base_currency: Optional[str] = "BRL",
+        risk_free: Union[float, pd.Series, RiskFreeRate] = 0.0,
+        portfolio_id: int = 0
     ):
         """
-        prices: DataFrame com colunas de ativos e índice de datas.
+        prices: DataFrame com colunas de ativos e índice de datas (ou AlignedPanel).
+            Só os ativos com peso entram nos retornos, a partir da primeira data
+            em que todos eles têm preço.
         weights: dicionário com pesos da carteira {'BTC-USD': 0.3, 'IMAB11.SA': 0.7}.
         rebalance: se True, ativa o rebalanceamento.
         rebalance_threshold: desvio percentual que aciona o rebalanceamento (±5%).
-        rebalance_frequency: intervalo de rebalanceamento ('M', 'Q', 'Y').
+        rebalance_frequency: intervalo de rebalanceamento ('D', 'W', 'M', 'Q', 'Y',
+            lista de datas ou None). As datas são pré-calculadas antes da simulação.
+        rebalance_calendar: calendário de dias úteis ('B3', 'B' ou None).
+        rebalance_trigger: 'either', 'calendar', 'band' ou 'hybrid' (ver apply_rebalance).
+        transaction_cost: custo por unidade de capital negociado nos rebalanceamentos.
+        base_currency: 'BRL' (default, mesma moeda de stats.csv e do otimizador)
+            converte os ativos cotados em dólar para reais usando a coluna BRL=X
+            de `prices`; None usa os preços como recebidos.
+        risk_free: taxa livre de risco usada nas métricas (float anual, série
+            diária ou RiskFreeRate, ex: load_cdi()).
+        portfolio_id: identificador gravado no histórico de rebalanceamentos.
         """
-        self.prices = prices
+        if base_currency not in (None, "BRL"):
+            raise ValueError(f"Moeda base não suportada: {base_currency}")
+        panel = prices if isinstance(prices, AlignedPanel) else align_prices(prices)
+        self.panel = panel.to_brl() if base_currency == "BRL" else panel
+        self.prices = self.panel.prices
+        self.base_currency = base_currency
         self.weights = weights
         self.rebalance = rebalance
         self.threshold = rebalance_threshold
         self.frequency = rebalance_frequency
+        self.calendar = rebalance_calendar
+        self.trigger = rebalance_trigger
+        self.transaction_cost = transaction_cost
+        self.risk_free = risk_free
+        self.portfolio_id = portfolio_id
         self.results = None
-        self.log = []
+        self.log = RebalanceLog(list(weights))
 
     def compute_returns(self) -> pd.DataFrame:
-        """Calcula retornos percentuais dos ativos."""
-        return self.prices.pct_change().dropna()
+        """Retornos percentuais dos ativos da carteira (ver AlignedPanel.held_returns)."""
+        return self.panel.held_returns(self.weights)
 
-    def run(self) -> Tuple[pd.Series, List[Dict]]:
+    def run(self) -> Tuple[pd.Series, RebalanceLog]:
         """Executa o backtest completo da carteira."""
-        returns = self.compute_returns()
-        weights_df = pd.DataFrame(self.weights, index=returns.index)
-        portfolio_returns = (returns * weights_df).sum(axis=1)
-        portfolio_value = (1 + portfolio_returns).cumprod()
-
-        if self.rebalance:
+        if not self.rebalance:
+            returns = self.compute_returns()
+            assets = list(self.weights)
+            w = np.array([self.weights[a] for a in assets], dtype=float)
+            portfolio_returns = returns[assets].to_numpy() @ w
+            portfolio_value = pd.Series(np.cumprod(1 + portfolio_returns), index=returns.index)
+        else:
             portfolio_value, self.log = apply_rebalance(
-                prices=self.prices,
+                prices=self.panel,
                 weights=self.weights,
                 threshold=self.threshold,
-                frequency=self.frequency
+                frequency=self.frequency,
+                calendar=self.calendar,
+                trigger=self.trigger,
+                transaction_cost=self.transaction_cost,
+                portfolio_id=self.portfolio_id
             )
 
-        self.results = portfolio_value
+        # curva das métricas parte de 1.0 na data inicial, para contar o primeiro retorno
+        start = self.panel.common_start(self.weights)
+        curve = pd.concat([pd.Series([1.0], index=[start]), portfolio_value])
+        self.results = annotate_frequency(curve, periods_per_year(self.prices))
         return portfolio_value, self.log
 
+    def get_metrics(self, benchmark: Optional[pd.Series] = None) -> PerformanceMetrics:
+        """Métricas de performance da última execução, descontando a taxa livre de risco."""
+        if self.results is None:
+            self.run()
+        return PerformanceMetrics(self.results, benchmark=benchmark, risk_free=self.risk_free)
+
     def get_summary(self):
         """Resumo simples do resultado."""
+        ppy = periods_per_year(self.results)
         total_return = self.results.iloc[-1] - 1
-        annualized_return = (self.results.iloc[-1]) ** (252 / len(self.results)) - 1
+        annualized_return = (self.results.iloc[-1]) ** (ppy / (len(self.results) - 1)) - 1
         print(f"Retorno Total: {total_return:.2%}")
         print(f"Retorno Anualizado: {annualized_return:.2%}")
@@ -0,0 +1,353 @@
+# src/data_collection/bcb_sgs.py
+import os
+import asyncio
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+SGS_URL = "https://api.bcb.gov.br/dados/serie/bcdata.sgs.{code}/dados"
+
+# Séries do SGS usadas pelo framework: nome -> código
+SERIES = {
+    "CDI": 12,     # taxa diária (% a.d.)
+    "SELIC": 11,   # taxa diária (% a.d.)
+    "IPCA": 433,   # variação mensal (%)
+    "PTAX": 1,     # dólar comercial venda (R$/US$)
+}
+
+# Séries publicadas em percentual (convertidas para decimal no cache)
+PERCENT_SERIES = {"CDI", "SELIC", "IPCA"}
+
+DEFAULT_START = "2015-01-01"
+
+# A API limita consultas de séries diárias a janelas de 10 anos
+MAX_WINDOW_DAYS = 3650
+
+# Dias recentes ainda podem ser publicados com atraso; só são marcados como
+# cobertos no cache depois deste prazo (ou quando já vieram com dados)
+PUBLICATION_LAG_DAYS = 7
+
+CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "raw", "bcb"))
+
+
+class SGSRequestError(RuntimeError):
+    """Falha ao consultar a API do SGS."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        # erros de rede (sem status), rate limit e erros do servidor
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+# ============================================================
+# Transportes HTTP
+# ============================================================
+
+class HTTPTransport(ABC):
+    """
+    Interface mínima de transporte HTTP usada pelo SGSClient.
+
+    Implementações devem retornar o JSON decodificado da resposta, uma lista
+    vazia quando o SGS não possui dados no intervalo (HTTP 404), e lançar
+    SGSRequestError nos demais casos de erro.
+    """
+
+    @abstractmethod
+    async def get_json(self, url: str, params: Dict[str, str]) -> List[Dict]:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class AiohttpTransport(HTTPTransport):
+    """Transporte baseado em aiohttp, com pool de conexões compartilhado."""
+
+    def __init__(self, max_connections: int = 8, timeout: float = 30.0):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session = None
+
+    async def _get_session(self):
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def get_json(self, url: str, params: Dict[str, str]) -> List[Dict]:
+        import aiohttp
+
+        session = await self._get_session()
+        try:
+            async with session.get(url, params=params) as resp:
+                if resp.status == 404:
+                    return []
+                if resp.status != 200:
+                    raise SGSRequestError(f"HTTP {resp.status} em {url}", status=resp.status)
+                return await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise SGSRequestError(f"Erro de conexão em {url}: {e}") from e
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class UrllibTransport(HTTPTransport):
+    """
+    Transporte apenas com a biblioteca padrão (urllib em threads).
+    O semáforo limita o número de conexões simultâneas.
+    """
+
+    def __init__(self, max_connections: int = 8, timeout: float = 30.0):
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    def _get(self, url: str) -> List[Dict]:
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return []
+            raise SGSRequestError(f"HTTP {e.code} em {url}", status=e.code) from e
+        except (urllib.error.URLError, TimeoutError, OSError) as e:
+            raise SGSRequestError(f"Erro de conexão em {url}: {e}") from e
+
+    async def get_json(self, url: str, params: Dict[str, str]) -> List[Dict]:
+        full_url = f"{url}?{urllib.parse.urlencode(params)}"
+        async with self._semaphore:
+            return await asyncio.to_thread(self._get, full_url)
+
+
+def default_transport(max_connections: int = 8, timeout: float = 30.0) -> HTTPTransport:
+    """Usa aiohttp quando disponível; caso contrário, cai para urllib."""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return UrllibTransport(max_connections=max_connections, timeout=timeout)
+    return AiohttpTransport(max_connections=max_connections, timeout=timeout)
+
+
+# ============================================================
+# Cache local
+# ============================================================
+
+def read_cache(name: str, cache_dir: str = CACHE_DIR) -> pd.Series:
+    """Lê a série em cache (colunas data, valor). Retorna série vazia se não existir."""
+    path = os.path.join(cache_dir, f"{name}.csv")
+    if not os.path.exists(path):
+        return pd.Series(dtype=float, name=name, index=pd.DatetimeIndex([], name="data"))
+    df = pd.read_csv(path, index_col=0, parse_dates=True)
+    s = df["valor"].astype(float)
+    s.name = name
+    return s
+
+
+def write_cache(series: pd.Series, name: str, cache_dir: str = CACHE_DIR) -> str:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{name}.csv")
+    series.rename("valor").rename_axis("data").to_csv(path)
+    return path
+
+
+def read_coverage(name: str, cache_dir: str = CACHE_DIR) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Intervalo [início, fim] já consultado na API (arquivo <serie>.coverage.json ao lado do CSV)."""
+    path = os.path.join(cache_dir, f"{name}.coverage.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return pd.Timestamp(data["start"]), pd.Timestamp(data["end"])
+
+
+def write_coverage(start: pd.Timestamp, end: pd.Timestamp, name: str, cache_dir: str = CACHE_DIR) -> str:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{name}.coverage.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"start": start.strftime("%Y-%m-%d"), "end": end.strftime("%Y-%m-%d")}, f)
+    return path
+
+
+# ============================================================
+# Cliente SGS
+# ============================================================
+
+def _date_windows(start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Quebra [start, end] em janelas aceitas pela API."""
+    windows = []
+    cur = start
+    while cur <= end:
+        stop = min(cur + timedelta(days=MAX_WINDOW_DAYS - 1), end)
+        windows.append((cur, stop))
+        cur = stop + timedelta(days=1)
+    return windows
+
+
+def _parse_records(records: List[Dict], name: str) -> pd.Series:
+    if not records:
+        return pd.Series(dtype=float, name=name, index=pd.DatetimeIndex([], name="data"))
+    df = pd.DataFrame(records)
+    index = pd.DatetimeIndex(pd.to_datetime(df["data"], format="%d/%m/%Y"), name="data")
+    values = pd.to_numeric(df["valor"], errors="coerce").to_numpy()
+    if name in PERCENT_SERIES:
+        values = values / 100
+    return pd.Series(values, index=index, name=name).dropna()
+
+
+class SGSClient:
+    """
+    Cliente assíncrono para a API SGS do Banco Central.
+
+    Baixa várias séries em paralelo, com retentativas e atualização incremental
+    de um cache local em CSV (um arquivo por série).
+    """
+
+    def __init__(
+        self,
+        transport: Optional[HTTPTransport] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        cache_dir: str = CACHE_DIR,
+        base_url: str = SGS_URL,
+    ):
+        """
+        transport: transporte HTTP (default: aiohttp se instalado, senão urllib).
+        retries: número de novas tentativas após a primeira falha.
+        backoff: espera inicial entre tentativas, em segundos (dobra a cada falha).
+        cache_dir: diretório do cache local.
+        base_url: URL da API com o placeholder {code}.
+        """
+        self.transport = transport or default_transport()
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.transport.close()
+
+    async def _request(self, code: int, start: pd.Timestamp, end: pd.Timestamp) -> List[Dict]:
+        url = self.base_url.format(code=code)
+        params = {
+            "formato": "json",
+            "dataInicial": start.strftime("%d/%m/%Y"),
+            "dataFinal": end.strftime("%d/%m/%Y"),
+        }
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                return await self.transport.get_json(url, params)
+            except SGSRequestError as e:
+                if not e.retryable or attempt == self.retries:
+                    raise
+                await asyncio.sleep(delay)
+                delay *= 2
+        return []
+
+    async def fetch_series(self, name: str, code: int, start, end) -> pd.Series:
+        """Baixa a série no intervalo [start, end], sem usar o cache."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        chunks = await asyncio.gather(
+            *(self._request(code, s, e) for s, e in _date_windows(start, end))
+        )
+        records = [r for chunk in chunks for r in chunk]
+        series = _parse_records(records, name)
+        return series[~series.index.duplicated(keep="last")].sort_index()
+
+    async def update_series(self, name: str, code: int, start=DEFAULT_START, end=None) -> pd.Series:
+        """
+        Atualiza o cache da série baixando apenas os intervalos ausentes
+        e retorna a série completa em [start, end].
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp(datetime.today().date())
+
+        cached = read_cache(name, self.cache_dir)
+        coverage = read_coverage(name, self.cache_dir)
+        if coverage is None and not cached.empty:
+            # cache antigo, sem arquivo de cobertura: usa as datas observadas
+            coverage = (cached.index.min(), cached.index.max())
+
+        ranges = []
+        if coverage is None:
+            ranges.append((start, end))
+        else:
+            first, last = coverage
+            if start < first:
+                ranges.append((start, first - timedelta(days=1)))
+            if end > last:
+                ranges.append((last + timedelta(days=1), end))
+
+        if ranges:
+            parts = await asyncio.gather(*(self.fetch_series(name, code, s, e) for s, e in ranges))
+            new = [p for p in parts if not p.empty]
+            if new:
+                cached = pd.concat([cached, *new]) if not cached.empty else pd.concat(new)
+                cached = cached[~cached.index.duplicated(keep="last")].sort_index()
+                cached.name = name
+                write_cache(cached, name, self.cache_dir)
+
+            # registra o intervalo consultado (inclusive dias sem publicação, ex: feriados);
+            # o fim só avança até o último dado ou até o prazo de publicação
+            sealed_end = min(end, pd.Timestamp(datetime.today().date()) - timedelta(days=PUBLICATION_LAG_DAYS))
+            ends = [sealed_end]
+            if coverage:
+                ends.append(coverage[1])
+            if not cached.empty:
+                ends.append(cached.index.max())
+            covered_start = min(start, coverage[0]) if coverage else start
+            write_coverage(covered_start, max(ends), name, self.cache_dir)
+
+        return cached.loc[start:end]
+
+    async def update_many(self, series: Optional[Dict[str, int]] = None, start=DEFAULT_START, end=None) -> Dict[str, pd.Series]:
+        """Atualiza várias séries em paralelo."""
+        series = series or SERIES
+        results = await asyncio.gather(
+            *(self.update_series(name, code, start, end) for name, code in series.items())
+        )
+        return dict(zip(series.keys(), results))
+
+
+def fetch_sgs_series(
+    series: Optional[Dict[str, int]] = None,
+    start=DEFAULT_START,
+    end=None,
+    transport: Optional[HTTPTransport] = None,
+    cache_dir: str = CACHE_DIR,
+    base_url: str = SGS_URL,
+) -> pd.DataFrame:
+    """Versão síncrona de SGSClient.update_many; retorna um DataFrame com uma coluna por série."""
+
+    async def _run():
+        async with SGSClient(transport=transport, cache_dir=cache_dir, base_url=base_url) as client:
+            return await client.update_many(series, start, end)
+
+    results = asyncio.run(_run())
+    return pd.concat(results, axis=1)
@@ -1,19 +1,27 @@
 # src/data_collection/fetch_bcb.py
-import requests
-import pandas as pd
 import os
+import pandas as pd
+
+from src.data_collection.bcb_sgs import DEFAULT_START, SERIES, fetch_sgs_series
+
+RAW_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "raw"))
+
 
-def fetch_cdi():
-    url = "https://api.bcb.gov.br/dados/serie/bcdata.sgs.12/dados?formato=json&dataInicial=09/10/2015"
-    data = pd.DataFrame(requests.get(url).json())
-    data['data'] = pd.to_datetime(data['data'], format='%d/%m/%Y')
-    data['valor'] = data['valor'].astype(float) / 100
-    data = data.set_index('data').resample('M').last()
-    
-    os.makedirs("data/raw", exist_ok=True)
-    data.to_csv("data/raw/cdi.csv")
+def fetch_macro_series(start=DEFAULT_START, end=None, transport=None) -> pd.DataFrame:
+    """Atualiza o cache e retorna CDI, SELIC, IPCA e PTAX (uma coluna por série)."""
+    return fetch_sgs_series(SERIES, start=start, end=end, transport=transport)
+
+
+def fetch_cdi(start=DEFAULT_START, end=None, transport=None) -> pd.DataFrame:
+    daily = fetch_sgs_series({"CDI": SERIES["CDI"]}, start=start, end=end, transport=transport)
+    data = daily.rename(columns={"CDI": "valor"}).rename_axis("data")
+    data = data.resample("ME").last()
+
+    os.makedirs(RAW_DIR, exist_ok=True)
+    data.to_csv(os.path.join(RAW_DIR, "cdi.csv"))
     print("CDI salvo em data/raw/cdi.csv")
     return data
 
+
 if __name__ == "__main__":
     fetch_cdi()
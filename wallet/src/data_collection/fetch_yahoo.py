@@ -1,10 +1,9 @@
 # src/data_collection/fetch_yahoo.py
 import yfinance as yf
-import pandas as pd
 import os
 from datetime import datetime
 
-def fetch_yahoo_data(start="2015-01-01", end=None, interval="1mo"):
+def fetch_yahoo_data(start="2015-01-01", end=None, interval="1d"):
     if end is None:
         end = datetime.today().strftime("%Y-%m-%d")
 
@@ -18,25 +17,25 @@ def fetch_yahoo_data(start="2015-01-01", end=None, interval="1mo"):
         "Bitcoin": "BTC-USD",
     }
 
-    all_data = pd.DataFrame()
-
-    for nome, code in tickers.items():
-        print(f"Baixando {nome} ({code}) ...")
-        try:
-            # usa Close (ajustado automaticamente)
-            df = yf.download(code, start=start, end=end, interval=interval, progress=False)
-            
-            if "Adj Close" in df.columns:
-                series = df["Adj Close"]
-            elif "Close" in df.columns:
-                series = df["Close"]
-            else:
-                raise KeyError("Nenhuma coluna 'Close' ou 'Adj Close' encontrada.")
-            
-            series.name = nome
-            all_data = pd.concat([all_data, series], axis=1)
-        except Exception as e:
-            print(f"Falha ao baixar {nome}: {e}")
+    # um único download em lote (threads do yfinance) em vez de uma requisição por ativo
+    print(f"Baixando {len(tickers)} ativos ({interval}) ...")
+    df = yf.download(
+        list(tickers.values()), start=start, end=end, interval=interval,
+        progress=False, group_by="column", threads=True
+    )
+
+    # usa Close (ajustado automaticamente)
+    fields = df.columns.get_level_values(0)
+    if "Adj Close" in fields:
+        prices = df["Adj Close"]
+    elif "Close" in fields:
+        prices = df["Close"]
+    else:
+        raise KeyError("Nenhuma coluna 'Close' ou 'Adj Close' encontrada.")
+
+    names = {code: nome for nome, code in tickers.items()}
+    all_data = prices.dropna(axis=1, how="all").rename(columns=names)
+    all_data = all_data[[n for n in tickers if n in all_data.columns]]
 
     all_data = all_data.dropna(how="all")
 
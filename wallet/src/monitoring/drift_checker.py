@@ -1,17 +1,12 @@
 import os
+import time
 import pandas as pd
-import numpy as np
 import logging
+from src.preprocessing.alignment import load_aligned_prices
+from src.monitoring.logging_config import configure_logging, log_event
 
 
-# === CONFIGURAÇÃO DE LOG ===
-LOG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "wallet", "logs"))
-os.makedirs(LOG_DIR, exist_ok=True)
-logging.basicConfig(
-    filename=os.path.join(LOG_DIR, "monitoring.log"),
-    level=logging.INFO,
-    format="%(asctime)s [DRIFT_CHECKER] %(levelname)s: %(message)s"
-)
+logger = logging.getLogger("src.monitoring.drift_checker")
 
 
 def compute_drift(current_weights: pd.Series, target_weights: pd.Series, relative: bool = False) -> pd.Series:
@@ -27,12 +22,17 @@ def compute_drift(current_weights: pd.Series, target_weights: pd.Series, relativ
             drift = aligned - target_weights
         return drift
     except Exception as e:
-        logging.error(f"Erro ao calcular drift: {e}")
+        logger.error(f"Erro ao calcular drift: {e}")
         raise
 
 
-def check_drift(age: int = 40, threshold: float = 0.05, relative: bool = False, window_days: int = 90) -> pd.DataFrame:
-    """Verifica o drift da carteira com validação e logging."""
+def check_drift(age: int = 40, threshold: float = 0.05, relative: bool = False, window_days: int = 90,
+                verbose: bool = True) -> pd.DataFrame:
+    """
+    Verifica o drift da carteira com validação e logging.
+    verbose=False suprime o print (ex: monitoramento em lote); o evento é sempre registrado no log.
+    """
+    start = time.perf_counter()
     try:
         # Caminhos
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
@@ -54,18 +54,17 @@ def check_drift(age: int = 40, threshold: float = 0.05, relative: bool = False,
         target_df = pd.read_csv(target_path, index_col=0)
         target = target_df.squeeze("columns") / target_df.squeeze("columns").sum()
 
-        prices = pd.read_csv(prices_path, index_col=0, parse_dates=True)
-        prices = prices.ffill().bfill().replace(0, np.nan).dropna(axis=1, how="any")
+        panel = load_aligned_prices(prices_path, base_currency="BRL")
 
-        if prices.shape[0] < 60:
+        if len(panel) < 60:
             raise ValueError("Histórico de preços insuficiente (<60 dias).")
 
         # Janela de 90 dias
-        if isinstance(prices.index, pd.DatetimeIndex):
-            cutoff = prices.index.max() - pd.Timedelta(days=window_days)
-            prices = prices.loc[prices.index >= cutoff]
+        cutoff = panel.prices.index.max() - pd.Timedelta(days=window_days)
+        panel = panel.window(start=cutoff)
 
-        returns = prices.pct_change(fill_method=None).fillna(0)
+        # ativos sem cotação no período não variam
+        returns = panel.returns().fillna(0)
         cumulative_returns = (1 + returns).prod()
         cumulative_returns = cumulative_returns.reindex(target.index).fillna(1.0)
 
@@ -84,20 +83,24 @@ def check_drift(age: int = 40, threshold: float = 0.05, relative: bool = False,
         drift_report.to_csv(drift_path)
 
         max_drift = drift.abs().max()
+        breached = bool(max_drift > threshold)
         msg = f"Drift máximo {max_drift:.2%} (limite {threshold:.2%})"
-        if max_drift > threshold:
+        if verbose:
             print(f"{msg}")
-            logging.warning(msg)
-        else:
-            print(f"{msg}")
-            logging.info(msg)
+        log_event(
+            logger, "drift_check", logging.WARNING if breached else logging.INFO,
+            portfolio_id=f"{age}anos", max_drift=float(max_drift), threshold=threshold,
+            breached=breached, asset=drift.abs().idxmax(), window_days=window_days,
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 3),
+        )
 
         return drift_report
 
     except Exception as e:
-        logging.error(f"Erro geral em check_drift: {e}")
+        log_event(logger, "drift_check_error", logging.ERROR, portfolio_id=f"{age}anos", error=str(e))
         raise
 
 
 if __name__ == "__main__":
+    configure_logging()
     check_drift(age=40, threshold=0.05, window_days=90)
@@ -0,0 +1,92 @@
+import os
+import json
+import queue
+import atexit
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+
+LOG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "logs"))
+# Arquivo próprio para o JSON (monitoring.log antigo é texto simples)
+LOG_PATH = os.path.join(LOG_DIR, "monitoring.jsonl")
+LOGGER_NAME = "src.monitoring"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por evento: timestamp, nível, logger, mensagem e campos extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_logging(
+    path: str = LOG_PATH,
+    level: int = logging.INFO,
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 5,
+    console: bool = False,
+) -> QueueListener:
+    """
+    Configura o logging do monitoramento uma única vez, na inicialização.
+
+    Os módulos de monitoramento apenas enfileiram os registros (QueueHandler
+    no logger "src.monitoring", sem propagar para o raiz, para não capturar
+    logs de aiohttp, matplotlib, yfinance etc.); uma thread (QueueListener)
+    os grava em JSON no arquivo com rotação por tamanho. Chamadas repetidas
+    devolvem o listener já ativo.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if console:
+        stream = logging.StreamHandler()
+        stream.setFormatter(JsonFormatter())
+        handlers.append(stream)
+
+    log_queue = queue.Queue(-1)
+    _queue_handler = QueueHandler(log_queue)
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.addHandler(_queue_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila, fecha os arquivos e remove o handler do logger de monitoramento."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.removeHandler(_queue_handler)
+    logger.propagate = True
+    _listener, _queue_handler = None, None
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, **fields) -> None:
+    """Registra um evento estruturado (ex: drift, limite, id da carteira, tempos)."""
+    logger.log(level, event, extra={"fields": {"event": event, **fields}})
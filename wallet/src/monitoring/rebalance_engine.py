@@ -1,25 +1,20 @@
 import os
+import time
 import pandas as pd
-import numpy as np
 import logging
+from src.preprocessing.alignment import load_aligned_prices
 from src.monitoring.drift_checker import compute_drift
+from src.monitoring.logging_config import configure_logging, log_event
 
 
-# === CONFIGURAÇÃO DE LOG ===
-LOG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "wallet", "logs"))
-os.makedirs(LOG_DIR, exist_ok=True)
-logging.basicConfig(
-    filename=os.path.join(LOG_DIR, "monitoring.log"),
-    level=logging.INFO,
-    format="%(asctime)s [REBALANCE_ENGINE] %(levelname)s: %(message)s"
-)
+logger = logging.getLogger("src.monitoring.rebalance_engine")
 
 
-def should_rebalance(drift: pd.Series, threshold: float = 0.05) -> bool:
+def should_rebalance(drift: pd.Series, threshold: float = 0.05, verbose: bool = True) -> bool:
     """Retorna True se o drift máximo exceder a tolerância."""
     max_drift = drift.abs().max()
-    print(f"Drift máximo observado: {max_drift:.2%}")
-    logging.info(f"Drift máximo observado: {max_drift:.2%}")
+    if verbose:
+        print(f"Drift máximo observado: {max_drift:.2%}")
     return max_drift > threshold
 
 
@@ -30,8 +25,13 @@ def rebalance_portfolio(target_weights: pd.Series) -> pd.Series:
     return new_weights
 
 
-def auto_rebalance(age: int = 40, threshold: float = 0.05, window_days: int = 90):
-    """Executa o rebalanceamento proporcional com validação e logging."""
+def auto_rebalance(age: int = 40, threshold: float = 0.05, window_days: int = 90, verbose: bool = True):
+    """
+    Executa o rebalanceamento proporcional com validação e logging.
+    verbose=False suprime os prints (ex: monitoramento em lote); os eventos são sempre registrados no log.
+    """
+    start = time.perf_counter()
+    portfolio_id = f"{age}anos"
     try:
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
         results_dir = os.path.join(base_dir, "wallet", "data", "results")
@@ -49,18 +49,19 @@ def auto_rebalance(age: int = 40, threshold: float = 0.05, window_days: int = 90
         target = pd.read_csv(target_path, index_col=0).squeeze("columns")
         target = target / target.sum()
 
-        prices = pd.read_csv(prices_path, index_col=0, parse_dates=True)
-        prices = prices.ffill().bfill().replace(0, np.nan).dropna(axis=1, how="any")
+        panel = load_aligned_prices(prices_path, base_currency="BRL")
 
-        if prices.shape[0] < 60:
+        if len(panel) < 60:
             raise ValueError("Histórico de preços insuficiente (<60 dias).")
 
         # Limitar aos últimos N dias
-        cutoff = prices.index.max() - pd.Timedelta(days=window_days)
-        prices = prices.loc[prices.index >= cutoff]
-        print(f"Usando dados dos últimos {window_days} dias ({prices.index.min().date()} → {prices.index.max().date()})")
+        cutoff = panel.prices.index.max() - pd.Timedelta(days=window_days)
+        panel = panel.window(start=cutoff)
+        if verbose:
+            print(f"Usando dados dos últimos {window_days} dias ({panel.prices.index.min().date()} → {panel.prices.index.max().date()})")
 
-        returns = prices.pct_change(fill_method=None).fillna(0)
+        # ativos sem cotação no período não variam
+        returns = panel.returns().fillna(0)
         cumulative_returns = (1 + returns).prod()
         cumulative_returns = cumulative_returns.reindex(target.index).fillna(1.0)
 
@@ -69,29 +70,37 @@ def auto_rebalance(age: int = 40, threshold: float = 0.05, window_days: int = 90
 
         drift = compute_drift(current_weights, target)
 
-        if should_rebalance(drift, threshold):
-            print(f"⚠️  Drift excedeu tolerância ({threshold:.0%}). Rebalanceando...")
-            logging.warning(f"Drift excedeu tolerância ({threshold:.0%})")
+        max_drift = float(drift.abs().max())
+        fields = dict(portfolio_id=portfolio_id, max_drift=max_drift, threshold=threshold,
+                      window_days=window_days)
 
+        if should_rebalance(drift, threshold, verbose):
             new_portfolio = rebalance_portfolio(target)
             output_file = os.path.join(results_dir, f"rebalanced_portfolio_{age}anos.csv")
             new_portfolio.to_csv(output_file)
 
             post_drift = compute_drift(new_portfolio, target).abs().max()
-            print(f"Carteira reequilibrada salva em: {output_file}")
-            print(f"Drift após rebalanceamento: {post_drift:.2%}")
-            logging.info(f"Carteira rebalanceada. Drift final: {post_drift:.2%}")
+            if verbose:
+                print(f"⚠️  Drift excedeu tolerância ({threshold:.0%}). Rebalanceando...")
+                print(f"Carteira reequilibrada salva em: {output_file}")
+                print(f"Drift após rebalanceamento: {post_drift:.2%}")
+            log_event(logger, "rebalance", logging.WARNING, **fields, rebalanced=True,
+                      post_drift=float(post_drift), output=output_file,
+                      elapsed_ms=round((time.perf_counter() - start) * 1000, 3))
 
             return new_portfolio
         else:
-            print(f"Nenhum rebalanceamento necessário (drift ≤ {threshold:.0%}).")
-            logging.info("Drift dentro da faixa, rebalanceamento não necessário.")
+            if verbose:
+                print(f"Nenhum rebalanceamento necessário (drift ≤ {threshold:.0%}).")
+            log_event(logger, "rebalance", logging.INFO, **fields, rebalanced=False,
+                      elapsed_ms=round((time.perf_counter() - start) * 1000, 3))
             return target
 
     except Exception as e:
-        logging.error(f"Erro geral no rebalanceamento: {e}")
+        log_event(logger, "rebalance_error", logging.ERROR, portfolio_id=portfolio_id, error=str(e))
         raise
 
 
 if __name__ == "__main__":
+    configure_logging()
     auto_rebalance(age=40, threshold=0.05, window_days=90)
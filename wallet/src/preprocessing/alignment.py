@@ -0,0 +1,172 @@
+# src/preprocessing/alignment.py
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.frequency import infer_periods_per_year
+from src.preprocessing.fx import fx_series, to_brl, usd_columns
+
+
+RAW_PRICES_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "raw", "prices_raw.csv"))
+
+
+class AlignedPanel:
+    """
+    Painel de preços alinhado e validado, com máscara de disponibilidade por ativo.
+
+    - `prices`: preços em um índice de datas único e ordenado, preenchidos
+      apenas para frente (nunca com preços futuros).
+    - `available`: True onde o ativo tem preço válido (observado ou repetido
+      do último pregão). Antes da primeira cotação o ativo fica indisponível,
+      em vez de o histórico inteiro ser descartado.
+    - `base_currency`: 'BRL' se os ativos em dólar já foram convertidos, None
+      se os preços estão na moeda de cotação original.
+    """
+
+    def __init__(self, prices: pd.DataFrame, available: pd.DataFrame, base_currency: Optional[str] = None):
+        self.prices = prices
+        self.available = available
+        self.base_currency = base_currency
+        self._returns = None
+
+    @property
+    def assets(self):
+        return list(self.prices.columns)
+
+    @property
+    def periods_per_year(self) -> float:
+        """Frequência do painel (inferida do índice), usada na anualização."""
+        return infer_periods_per_year(self.prices.index)
+
+    @property
+    def first_valid(self) -> pd.Series:
+        """Primeira data com preço de cada ativo."""
+        return self.available.idxmax().where(self.available.any())
+
+    def returns(self) -> pd.DataFrame:
+        """
+        Retornos simples por período, NaN onde o ativo não estava disponível
+        no período atual ou no anterior. Calculado uma única vez por painel.
+        """
+        if self._returns is None:
+            values = self.prices.to_numpy(dtype=float)
+            mask = self.available.to_numpy()
+            out = np.full(values.shape, np.nan)
+            valid = mask[1:] & mask[:-1]
+            out[1:][valid] = values[1:][valid] / values[:-1][valid] - 1
+            self._returns = pd.DataFrame(out, index=self.prices.index, columns=self.prices.columns)
+            self._returns.attrs["periods_per_year"] = self.periods_per_year
+        return self._returns
+
+    def common_start(self, assets) -> pd.Timestamp:
+        """Primeira data em que todos os `assets` têm preço."""
+        assets = list(assets)
+        missing = [a for a in assets if a not in self.prices.columns]
+        if missing:
+            raise ValueError(f"Ativos sem preço no painel: {missing}")
+        together = self.available[assets].all(axis=1)
+        if not together.any():
+            raise ValueError(f"Os ativos nunca têm preço na mesma data: {assets}")
+        return together.idxmax()
+
+    def held_returns(self, assets) -> pd.DataFrame:
+        """
+        Retornos apenas dos `assets` (ex: os ativos com peso na carteira), nas
+        datas posteriores a common_start(assets). Colunas de outros ativos não
+        removem linhas; lacunas posteriores sem cotação contam como retorno zero
+        (preço mantido).
+        """
+        assets = list(assets)
+        start = self.common_start(assets)
+        return self.returns().loc[start:, assets].iloc[1:].fillna(0.0)
+
+    def to_brl(self) -> "AlignedPanel":
+        """
+        Painel com os ativos em dólar convertidos para reais pelo BRL=X do
+        próprio painel. Um ativo em USD só fica disponível onde também há câmbio.
+        """
+        cols = usd_columns(self.prices.columns)
+        if self.base_currency == "BRL":
+            return self
+        if not cols:
+            return AlignedPanel(self.prices, self.available, "BRL")
+        fx_available = self.available[fx_series(self.prices).name]
+        available = self.available.copy()
+        available[cols] = available[cols].mul(fx_available, axis=0)
+        return AlignedPanel(to_brl(self.prices), available, "BRL")
+
+    def window(self, start=None, end=None) -> "AlignedPanel":
+        """Recorte do painel entre start e end (inclusive); retornos são recalculados no recorte."""
+        sl = slice(start, end)
+        return AlignedPanel(self.prices.loc[sl], self.available.loc[sl], self.base_currency)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+def align_prices(prices: pd.DataFrame, max_gap: Optional[int] = None) -> AlignedPanel:
+    """
+    Limpa e alinha um DataFrame de preços brutos.
+
+    Parameters
+    ----------
+    prices : pd.DataFrame
+        Preços brutos (uma coluna por ativo, índice de datas).
+    max_gap : int, optional
+        Número máximo de períodos consecutivos sem cotação preenchidos com o
+        último preço (default = sem limite). Lacunas maiores ficam indisponíveis.
+    """
+    prices = prices.copy()
+    prices.index = pd.DatetimeIndex(pd.to_datetime(prices.index))
+    prices = prices[~prices.index.duplicated(keep="last")].sort_index()
+    prices = prices.apply(pd.to_numeric, errors="coerce")
+
+    # preços não positivos são tratados como ausentes
+    prices = prices.where(prices > 0)
+    prices = prices.dropna(axis=0, how="all").dropna(axis=1, how="all")
+    if prices.empty:
+        raise ValueError("Nenhum preço válido encontrado após a limpeza.")
+
+    if max_gap is None or max_gap > 0:
+        prices = prices.ffill(limit=max_gap)
+    available = prices.notna()
+    return AlignedPanel(prices, available)
+
+
+_PANEL_CACHE: Dict[Tuple, AlignedPanel] = {}
+
+
+def load_aligned_prices(
+    path: Optional[str] = None,
+    max_gap: Optional[int] = None,
+    base_currency: Optional[str] = None,
+) -> AlignedPanel:
+    """
+    Lê data/raw/prices_raw.csv (ou `path`) e devolve o painel alinhado.
+
+    base_currency: 'BRL' converte os ativos cotados em dólar para reais;
+    None mantém a moeda de cotação original.
+
+    O resultado (já convertido) fica em cache enquanto o arquivo não for modificado.
+    """
+    if base_currency not in (None, "BRL"):
+        raise ValueError(f"Moeda base não suportada: {base_currency}")
+    path = os.path.abspath(path or RAW_PRICES_PATH)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo de preços não encontrado: {path}")
+
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, max_gap, base_currency)
+    panel = _PANEL_CACHE.get(key)
+    if panel is None:
+        raw = pd.read_csv(path, index_col=0, parse_dates=True)
+        panel = align_prices(raw, max_gap=max_gap)
+        if base_currency == "BRL":
+            panel = panel.to_brl()
+        # mantém apenas a versão mais recente de cada arquivo
+        for old in [k for k in _PANEL_CACHE if k[0] == path and k[3:] == key[3:]]:
+            del _PANEL_CACHE[old]
+        _PANEL_CACHE[key] = panel
+    return panel
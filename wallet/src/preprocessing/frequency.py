@@ -0,0 +1,69 @@
+# src/preprocessing/frequency.py
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Períodos por ano para os intervalos do yfinance
+INTERVAL_PERIODS = {
+    "1d": 252,
+    "5d": 52,
+    "1wk": 52,
+    "1mo": 12,
+    "3mo": 4,
+}
+
+DEFAULT_PERIODS_PER_YEAR = 252
+
+
+def infer_periods_per_year(index: pd.DatetimeIndex, default: float = DEFAULT_PERIODS_PER_YEAR) -> float:
+    """
+    Infere quantos períodos por ano o índice representa, a partir do espaçamento
+    mediano entre as datas.
+
+    - intraday: 252 × barras por pregão;
+    - diário: 252 (dias úteis) ou 365 quando há fins de semana (ex: cripto);
+    - semanal: 52; mensal: 12; trimestral: 4; anual: 1.
+
+    Índices com menos de 3 datas devolvem `default`.
+    """
+    index = pd.DatetimeIndex(index)
+    if len(index) < 3:
+        return default
+
+    days = np.diff(index.values.astype("datetime64[s]").astype(np.int64)) / 86_400
+    step = np.median(days)
+
+    if step < 0.9:
+        bars_per_day = pd.Series(1, index=index).groupby(index.normalize()).size().median()
+        return DEFAULT_PERIODS_PER_YEAR * float(bars_per_day)
+    if step <= 1.5:
+        weekend_share = np.mean(index.dayofweek >= 5)
+        return 365 if weekend_share > 0.1 else 252
+    if step <= 10:
+        return 52
+    if step <= 45:
+        return 12
+    if step <= 120:
+        return 4
+    return 1
+
+
+def periods_per_year(data: Union[pd.Series, pd.DataFrame, pd.DatetimeIndex]) -> float:
+    """
+    Períodos por ano de uma série/painel: usa o metadado `attrs['periods_per_year']`
+    quando presente; caso contrário, infere pelo índice.
+    """
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        ppy = data.attrs.get("periods_per_year")
+        if ppy:
+            return ppy
+        return infer_periods_per_year(data.index)
+    return infer_periods_per_year(data)
+
+
+def annotate_frequency(data: Union[pd.Series, pd.DataFrame], ppy: Optional[float] = None):
+    """Grava `periods_per_year` (informado ou inferido) em data.attrs e devolve `data`."""
+    data.attrs["periods_per_year"] = ppy or infer_periods_per_year(data.index)
+    return data
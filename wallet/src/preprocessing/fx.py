@@ -0,0 +1,66 @@
+# src/preprocessing/fx.py
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+# Cotação do dólar em reais (R$ por US$), baixada junto com os ativos
+FX_COLUMNS = ("BRL=X", "Dólar")
+
+# Moeda de cotação de cada ativo (tickers e nomes usados em fetch_yahoo_data).
+# Colunas fora do mapa são consideradas em BRL.
+CURRENCIES: Dict[str, str] = {
+    "IRFM11.SA": "BRL",
+    "IMAB11.SA": "BRL",
+    "^BVSP": "BRL",
+    "BRL=X": "BRL",
+    "^GSPC": "USD",
+    "GC=F": "USD",
+    "BTC-USD": "USD",
+    "Renda Fixa Prefixada": "BRL",
+    "Renda Fixa IPCA+": "BRL",
+    "Ações Brasil": "BRL",
+    "Dólar": "BRL",
+    "Ações Globais": "USD",
+    "Ouro": "USD",
+    "Bitcoin": "USD",
+}
+
+
+def usd_columns(columns, currencies: Optional[Dict[str, str]] = None) -> List[str]:
+    """Colunas cotadas em dólar."""
+    currencies = currencies or CURRENCIES
+    return [c for c in columns if currencies.get(c, "BRL") == "USD"]
+
+
+def fx_series(prices: pd.DataFrame) -> pd.Series:
+    """Localiza a série de câmbio (R$/US$) no painel."""
+    for col in FX_COLUMNS:
+        if col in prices.columns:
+            return prices[col]
+    raise ValueError(f"Série de câmbio não encontrada (esperado uma das colunas {FX_COLUMNS}).")
+
+
+def to_brl(
+    prices: pd.DataFrame,
+    fx: Optional[pd.Series] = None,
+    currencies: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Converte as colunas cotadas em dólar para reais.
+
+    A conversão é uma única multiplicação vetorizada de todas as colunas em
+    USD pelo câmbio da mesma data. Se `fx` não for informado, usa a coluna
+    BRL=X do próprio painel; o câmbio é reindexado às datas do painel e
+    repetido apenas para frente (sem usar cotações futuras).
+    """
+    cols = usd_columns(prices.columns, currencies)
+    if not cols:
+        return prices
+
+    fx = fx_series(prices) if fx is None else fx
+    fx = fx.reindex(prices.index.union(fx.index)).ffill().reindex(prices.index)
+
+    converted = prices.copy()
+    converted[cols] = prices[cols].mul(fx, axis=0)
+    return converted
@@ -0,0 +1,225 @@
+# src/preprocessing/incremental_stats.py
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.alignment import load_aligned_prices
+
+
+PROCESSED_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "processed"))
+STATE_PATH = os.path.join(PROCESSED_DIR, "stats_state.npz")
+
+
+class IncrementalStats:
+    """
+    Estatísticas de retornos mantidas por somas acumuladas, atualizáveis
+    apenas com as linhas novas.
+
+    Para cada par de ativos (i, j) guarda, sobre as linhas em que ambos têm
+    retorno: contagem, soma de x_i, soma de x_i² e soma de x_i·x_j. Isso
+    reproduz médias, volatilidades e a correlação pairwise de `DataFrame.corr()`
+    com custo O(linhas_novas · n²) por atualização.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        n = len(columns)
+        self.columns = list(columns)
+        self.count = np.zeros((n, n))
+        self.sum = np.zeros((n, n))
+        self.sum_sq = np.zeros((n, n))
+        self.cross = np.zeros((n, n))
+        self.last_date: Optional[pd.Timestamp] = None
+
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame) -> "IncrementalStats":
+        return cls(returns.columns).update(returns)
+
+    def update(self, returns: pd.DataFrame) -> "IncrementalStats":
+        """Incorpora novas linhas de retornos (NaN = ativo sem retorno no período)."""
+        if returns.empty:
+            return self
+        unknown = [c for c in returns.columns if c not in self.columns]
+        if unknown:
+            raise ValueError(f"Ativos novos exigem recálculo completo: {unknown}")
+        if self.last_date is not None and returns.index.min() <= self.last_date:
+            raise ValueError("As linhas novas devem ser posteriores à última data incorporada.")
+
+        x = returns.reindex(columns=self.columns).to_numpy(dtype=float)
+        mask = ~np.isnan(x)
+        x0 = np.where(mask, x, 0.0)
+        m = mask.astype(float)
+
+        self.count += m.T @ m
+        self.sum += x0.T @ m
+        self.sum_sq += (x0 * x0).T @ m
+        self.cross += x0.T @ x0
+        self.last_date = returns.index.max()
+        return self
+
+    def matches(self, returns: pd.DataFrame, tol: float = 1e-9) -> bool:
+        """
+        Confere se as linhas já incorporadas (até last_date) continuam iguais
+        em `returns`, comparando contagem, soma e soma dos quadrados por ativo.
+        Detecta revisões (barra parcial corrigida, preços reajustados pelo
+        provedor) com custo O(linhas · n).
+        """
+        if self.last_date is None:
+            return False
+        x = returns.loc[:self.last_date].reindex(columns=self.columns).to_numpy(dtype=float)
+        mask = ~np.isnan(x)
+        x0 = np.where(mask, x, 0.0)
+        got = np.concatenate([mask.sum(axis=0), x0.sum(axis=0), (x0 * x0).sum(axis=0)])
+        expected = np.concatenate([np.diag(self.count), np.diag(self.sum), np.diag(self.sum_sq)])
+        return bool(np.allclose(got, expected, rtol=tol, atol=tol))
+
+    def mean(self) -> pd.Series:
+        n = np.diag(self.count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.diag(self.sum) / n
+        return pd.Series(np.where(n > 0, mean, np.nan), index=self.columns)
+
+    def std(self) -> pd.Series:
+        n = np.diag(self.count)
+        s, ss = np.diag(self.sum), np.diag(self.sum_sq)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (ss - s * s / n) / (n - 1)
+        var = np.where(n > 1, np.maximum(var, 0.0), np.nan)
+        return pd.Series(np.sqrt(var), index=self.columns)
+
+    def corr(self) -> pd.DataFrame:
+        """Correlação pairwise (mesma convenção de DataFrame.corr())."""
+        n = self.count
+        sx, sy = self.sum, self.sum.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = n * self.cross - sx * sy
+            var_x = n * self.sum_sq - sx * sx
+            var_y = var_x.T
+            corr = cov / np.sqrt(var_x * var_y)
+        corr = np.where((n > 1) & (var_x > 0) & (var_y > 0), np.clip(corr, -1.0, 1.0), np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def stats(self, periods_per_year: float) -> pd.DataFrame:
+        """Retorno esperado e volatilidade anualizados (formato de stats.csv)."""
+        return pd.DataFrame({
+            "Retorno_Esperado": self.mean() * periods_per_year,
+            "Volatilidade": self.std() * np.sqrt(periods_per_year),
+        })
+
+    def save(self, path: str = STATE_PATH) -> str:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(
+            path,
+            columns=np.array(self.columns, dtype=str),
+            count=self.count, sum=self.sum, sum_sq=self.sum_sq, cross=self.cross,
+            # ISO 8601 preserva o fuso (barras intradiárias)
+            last_date=np.array(self.last_date.isoformat() if self.last_date is not None else ""),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str = STATE_PATH) -> "IncrementalStats":
+        with np.load(path) as data:
+            state = cls(data["columns"].tolist())
+            state.count = data["count"]
+            state.sum = data["sum"]
+            state.sum_sq = data["sum_sq"]
+            state.cross = data["cross"]
+            last = data["last_date"].item()
+        if isinstance(last, int):   # formato antigo (Timestamp.value, sem fuso)
+            last = pd.Timestamp(last) if last >= 0 else None
+        state.last_date = pd.Timestamp(last) if last else None
+        return state
+
+
+def _verify(state: IncrementalStats, returns: pd.DataFrame, ppy: float, tol: float) -> None:
+    """Compara o estado incremental com um recálculo completo."""
+    expected_stats = pd.DataFrame({
+        "Retorno_Esperado": returns.mean() * ppy,
+        "Volatilidade": returns.std() * np.sqrt(ppy),
+    })
+    checks = {
+        "stats": (state.stats(ppy), expected_stats),
+        "correlação": (state.corr(), returns.corr()),
+    }
+    for name, (got, expected) in checks.items():
+        got, expected = got.to_numpy(dtype=float), expected.to_numpy(dtype=float)
+        if not np.allclose(got, expected, rtol=tol, atol=tol, equal_nan=True):
+            diff = np.nanmax(np.abs(got - expected))
+            raise RuntimeError(f"Verificação falhou em {name}: diferença máxima {diff:.3e}")
+    print("Verificação OK: estatísticas incrementais iguais ao recálculo completo.")
+
+
+def update_statistics(
+    prices_path: Optional[str] = None,
+    processed_dir: str = PROCESSED_DIR,
+    verify: bool = False,
+    tol: float = 1e-9,
+):
+    """
+    Atualiza returns.csv, stats.csv e correlation_matrix.csv incorporando apenas
+    as datas novas de prices_raw.csv. É o único ponto que grava esses arquivos.
+
+    Na primeira execução, se os ativos mudarem ou se alguma linha já incorporada
+    tiver sido revisada (ex: barra parcial do dia corrigida, histórico reajustado),
+    o estado é reconstruído com todo o histórico. Com verify=True, o resultado é
+    conferido contra o recálculo completo antes de gravar; se divergir, o estado
+    é reconstruído (e um RuntimeError é lançado se ainda assim divergir).
+    """
+    panel = load_aligned_prices(prices_path, base_currency="BRL")
+    returns = panel.returns().dropna(how="all")
+    if returns.empty:
+        raise ValueError("Nenhum retorno pôde ser calculado (talvez faltam dados históricos.")
+    ppy = panel.periods_per_year
+
+    os.makedirs(processed_dir, exist_ok=True)
+    state_path = os.path.join(processed_dir, "stats_state.npz")
+    returns_path = os.path.join(processed_dir, "returns.csv")
+
+    state = None
+    if os.path.exists(state_path) and os.path.exists(returns_path):
+        state = IncrementalStats.load(state_path)
+        if state.columns != list(returns.columns) or state.last_date is None:
+            state = None
+        elif not state.matches(returns, tol):
+            print("Linhas já incorporadas foram revisadas; recalculando o histórico completo")
+            state = None
+
+    rebuilt = state is None
+    if rebuilt:
+        state = IncrementalStats.from_returns(returns)
+        new_rows = returns
+    else:
+        new_rows = returns.loc[returns.index > state.last_date]
+        state.update(new_rows)
+
+    if verify:
+        try:
+            _verify(state, returns, ppy, tol)
+        except RuntimeError as err:
+            if rebuilt:
+                raise
+            print(f"{err}; reconstruindo o estado com o histórico completo")
+            state, rebuilt = IncrementalStats.from_returns(returns), True
+            _verify(state, returns, ppy, tol)
+
+    if rebuilt:
+        returns.to_csv(returns_path)
+        print(f"Estado construído com {len(returns)} linhas")
+    else:
+        if not new_rows.empty:
+            new_rows.to_csv(returns_path, mode="a", header=False)
+        print(f"{len(new_rows)} linhas novas incorporadas")
+
+    stats = state.stats(ppy)
+    correlation = state.corr()
+    stats.to_csv(os.path.join(processed_dir, "stats.csv"))
+    correlation.to_csv(os.path.join(processed_dir, "correlation_matrix.csv"))
+    state.save(state_path)
+
+    return returns, stats, correlation
+
+
+if __name__ == "__main__":
+    update_statistics(verify=True)
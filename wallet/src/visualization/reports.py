@@ -0,0 +1,333 @@
+# src/visualization/reports.py
+import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.backtests.metrics import PerformanceMetrics
+from src.backtests.risk_free import load_cdi
+from src.preprocessing.alignment import load_aligned_prices
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+PROCESSED_DIR = os.path.join(BASE_DIR, "data", "processed")
+REPORTS_DIR = os.path.join(BASE_DIR, "data", "reports")
+
+# Incrementar quando o estilo dos gráficos mudar, para invalidar o cache
+RENDER_VERSION = 2
+
+
+# ============================================================
+# Hash dos dados de entrada
+# ============================================================
+
+def _update_hash(h, obj) -> None:
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(repr(getattr(obj, "columns", obj.name)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"{obj.dtype}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj):
+            h.update(str(key).encode())
+            _update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _update_hash(h, item)
+    else:
+        h.update(repr(obj).encode())
+
+
+def fingerprint(kind: str, data: dict) -> str:
+    """Hash SHA-256 do tipo de figura + dados de entrada."""
+    h = hashlib.sha256(f"{kind}:{RENDER_VERSION}".encode())
+    _update_hash(h, data)
+    return h.hexdigest()
+
+
+# ============================================================
+# Renderizadores (executados nos processos de trabalho)
+# ============================================================
+
+def _random_portfolios(mu: np.ndarray, sigma: np.ndarray, size: int = 5000):
+    """Carteiras long-only aleatórias (semente fixa) mais os cantos de um único ativo."""
+    rng = np.random.default_rng(0)
+    samples = np.vstack([rng.dirichlet(np.ones(len(mu)), size=size), np.eye(len(mu))])
+    rets = samples @ mu
+    vols = np.sqrt(np.einsum("ij,jk,ik->i", samples, sigma, samples))
+    return vols, rets
+
+
+def _frontier_solved(mu: np.ndarray, sigma: np.ndarray, points: int):
+    """Fronteira long-only exata: max mu·w s.a. w'Σw ≤ σ² numa grade de σ (como o otimizador)."""
+    import cvxpy as cp
+
+    n = len(mu)
+    sigma = 0.5 * (sigma + sigma.T) + 1e-8 * np.eye(n)
+    w = cp.Variable(n)
+    var = cp.quad_form(w, sigma)
+    constraints = [cp.sum(w) == 1, w >= 0]
+
+    cp.Problem(cp.Minimize(var), constraints).solve(solver=cp.SCS, verbose=False)
+    if w.value is None:
+        return None
+    low = float(np.sqrt(max(var.value, 0.0)))
+    high = float(np.sqrt(sigma[np.argmax(mu), np.argmax(mu)]))
+
+    max_var = cp.Parameter(nonneg=True)
+    prob = cp.Problem(cp.Maximize(mu @ w), constraints + [var <= max_var])
+    frontier = []
+    for target in np.linspace(low, high, points):
+        max_var.value = target ** 2
+        prob.solve(solver=cp.SCS, verbose=False)
+        if w.value is None:
+            continue
+        wv = np.clip(w.value, 0, None)
+        wv = wv / wv.sum()
+        frontier.append((float(np.sqrt(wv @ sigma @ wv)), float(wv @ mu)))
+    return frontier or None
+
+
+def _frontier_sampled(vols: np.ndarray, rets: np.ndarray, bins: int = 40):
+    """Aproximação sem solver: carteira de maior retorno de cada faixa de volatilidade (envoltória superior)."""
+    edges = np.linspace(vols.min(), vols.max(), bins)
+    idx = np.digitize(vols, edges)
+    best = [np.flatnonzero(idx == b)[np.argmax(rets[idx == b])] for b in np.unique(idx)]
+    best.append(int(np.argmin(vols)))   # ponta de menor risco
+    frontier, top = [], -np.inf
+    for i in sorted(best, key=lambda i: vols[i]):
+        if rets[i] > top:
+            frontier.append((float(vols[i]), float(rets[i])))
+            top = rets[i]
+    return frontier
+
+
+def efficient_frontier(mu: np.ndarray, sigma: np.ndarray, points: int = 30):
+    """
+    Pontos (volatilidade, retorno) da fronteira eficiente long-only e se são exatos.
+
+    Usa cvxpy (dependência do otimizador) quando disponível; caso contrário,
+    a envoltória de carteiras aleatórias, incluindo as de um único ativo.
+    """
+    try:
+        frontier = _frontier_solved(mu, sigma, points)
+    except ImportError:
+        frontier = None
+    if frontier:
+        return frontier, True
+    vols, rets = _random_portfolios(mu, sigma)
+    return _frontier_sampled(vols, rets), False
+
+
+def _plot_frontier(plt, data: dict, title: str):
+    mu, sigma, w = data["mu"], data["sigma"], data["weights"]
+
+    vols, rets = _random_portfolios(mu, sigma)
+    frontier, exact = efficient_frontier(mu, sigma)
+    fx, fy = zip(*frontier)
+
+    fig, ax = plt.subplots(figsize=(7, 5))
+    ax.scatter(vols, rets, s=3, alpha=0.3, c=rets / np.maximum(vols, 1e-12), cmap="viridis")
+    ax.plot(fx, fy, color="black", linewidth=1.2, label="Fronteira" if exact else "Fronteira (aprox.)")
+    ax.scatter([np.sqrt(w @ sigma @ w)], [w @ mu], color="red", marker="*", s=200, label="Carteira")
+    ax.set_xlabel("Volatilidade anual")
+    ax.set_ylabel("Retorno esperado anual")
+    ax.set_title(title)
+    ax.legend(loc="lower right")
+    return fig
+
+
+def _plot_correlation(plt, data: dict, title: str):
+    corr, names = data["corr"], data["names"]
+    fig, ax = plt.subplots(figsize=(7, 6))
+    im = ax.imshow(corr, cmap="RdBu_r", vmin=-1, vmax=1)
+    ax.set_xticks(range(len(names)), names, rotation=45, ha="right")
+    ax.set_yticks(range(len(names)), names)
+    for i in range(len(names)):
+        for j in range(len(names)):
+            if np.isfinite(corr[i, j]):
+                ax.text(j, i, f"{corr[i, j]:.2f}", ha="center", va="center", fontsize=8)
+    fig.colorbar(im, ax=ax)
+    ax.set_title(title)
+    fig.tight_layout()
+    return fig
+
+
+def _plot_drawdown(plt, data: dict, title: str):
+    dates = pd.DatetimeIndex(data["dates"])
+    equity = data["equity"]
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 6), sharex=True, height_ratios=[2, 1])
+    ax1.plot(dates, equity, color="tab:blue")
+    ax1.set_ylabel("Valor acumulado")
+    ax1.set_title(title)
+    ax2.fill_between(dates, drawdown, 0, color="tab:red", alpha=0.4)
+    ax2.set_ylabel("Drawdown")
+    fig.tight_layout()
+    return fig
+
+
+def _plot_metrics(plt, data: dict, title: str):
+    rows = [[k, "—" if not np.isfinite(v) else f"{v:.4f}"] for k, v in data["metrics"].items()]
+    fig, ax = plt.subplots(figsize=(5, 0.35 * len(rows) + 1))
+    ax.axis("off")
+    table = ax.table(cellText=rows, colLabels=["Métrica", "Valor"], loc="center", cellLoc="left")
+    table.scale(1, 1.3)
+    ax.set_title(title)
+    return fig
+
+
+RENDERERS = {
+    "frontier": _plot_frontier,
+    "correlation": _plot_correlation,
+    "drawdown": _plot_drawdown,
+    "metrics": _plot_metrics,
+}
+
+
+def _render_job(job: dict) -> str:
+    """Renderiza uma figura em PNG com backend não interativo."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig = RENDERERS[job["kind"]](plt, job["data"], job["title"])
+    os.makedirs(os.path.dirname(job["path"]), exist_ok=True)
+    fig.savefig(job["path"], dpi=job.get("dpi", 110))
+    plt.close(fig)
+    return job["path"]
+
+
+# ============================================================
+# Montagem dos trabalhos
+# ============================================================
+
+def load_report_inputs(processed_dir: str = PROCESSED_DIR, prices_path: Optional[str] = None) -> dict:
+    """Lê stats, correlação, preços em BRL e CDI usados nos relatórios."""
+    stats = pd.read_csv(os.path.join(processed_dir, "stats.csv"), index_col=0)
+    corr = pd.read_csv(os.path.join(processed_dir, "correlation_matrix.csv"), index_col=0)
+    corr = corr.loc[stats.index, stats.index]
+    panel = load_aligned_prices(prices_path, base_currency="BRL")
+    try:
+        risk_free = load_cdi()
+    except FileNotFoundError:
+        risk_free = 0.0
+    return {"stats": stats, "corr": corr, "panel": panel, "risk_free": risk_free}
+
+
+def build_jobs(portfolios: Dict[str, pd.Series], inputs: dict, out_dir: str = REPORTS_DIR) -> List[dict]:
+    """Uma figura de correlação para o universo + fronteira, drawdown e métricas por carteira."""
+    stats, corr, panel = inputs["stats"], inputs["corr"], inputs["panel"]
+    names = list(stats.index)
+    mu = stats["Retorno_Esperado"].to_numpy(dtype=float)
+    vol = stats["Volatilidade"].to_numpy(dtype=float)
+    sigma = np.diag(vol) @ np.nan_to_num(corr.to_numpy(dtype=float)) @ np.diag(vol)
+
+    jobs = [{
+        "kind": "correlation",
+        "name": "universo",
+        "title": "Matriz de correlação",
+        "data": {"corr": corr.to_numpy(dtype=float), "names": names},
+    }]
+
+    for name, weights in portfolios.items():
+        weights = weights[weights.index.isin(names)].astype(float)
+        w = weights.reindex(names, fill_value=0.0).to_numpy()
+
+        # curva começa em 1.0 na primeira data em que todos os ativos com peso têm preço
+        held = weights[(weights != 0) & weights.index.isin(panel.assets)]
+        returns = panel.held_returns(held.index)
+        growth = np.cumprod(1 + returns.to_numpy() @ held.to_numpy())
+        start = panel.common_start(held.index)
+        equity = pd.Series(np.concatenate([[1.0], growth]), index=returns.index.insert(0, start))
+        metrics = PerformanceMetrics(
+            equity, risk_free=inputs["risk_free"], periods_per_year=panel.periods_per_year
+        ).summary()
+
+        jobs += [
+            {"kind": "frontier", "name": name, "title": f"Fronteira eficiente — {name}",
+             "data": {"mu": mu, "sigma": sigma, "weights": w}},
+            {"kind": "drawdown", "name": name, "title": f"Valor acumulado e drawdown — {name}",
+             "data": {"dates": equity.index.to_numpy(), "equity": equity.to_numpy()}},
+            {"kind": "metrics", "name": name, "title": f"Métricas de risco — {name}",
+             "data": {"metrics": {k: float(v) for k, v in metrics.items()}}},
+        ]
+
+    for job in jobs:
+        job["path"] = os.path.join(out_dir, job["name"], f"{job['kind']}.png")
+        job["hash"] = fingerprint(job["kind"], job["data"])
+    return jobs
+
+
+# ============================================================
+# API pública
+# ============================================================
+
+def generate_batch_reports(
+    portfolios: Dict[str, pd.Series],
+    out_dir: str = REPORTS_DIR,
+    inputs: Optional[dict] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, List[str]]:
+    """
+    Gera os relatórios de várias carteiras (perfis ou clientes) de uma vez.
+
+    Cada figura é identificada pelo hash dos seus dados de entrada; apenas as
+    figuras cujo hash mudou (ou cujo arquivo não existe) são renderizadas, em
+    um pool de processos. As métricas de cada carteira também são salvas em
+    <out_dir>/<nome>/metrics.csv.
+
+    Returns
+    -------
+    dict
+        {'rendered': [...], 'cached': [...]} com os caminhos das figuras.
+    """
+    inputs = inputs or load_report_inputs()
+    jobs = build_jobs(portfolios, inputs, out_dir)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    def key(job):
+        return os.path.relpath(job["path"], out_dir)
+
+    pending, cached = [], []
+    for job in jobs:
+        if manifest.get(key(job)) == job["hash"] and os.path.exists(job["path"]):
+            cached.append(job["path"])
+        else:
+            pending.append(job)
+
+    if len(pending) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rendered = list(pool.map(_render_job, pending))
+    else:
+        rendered = [_render_job(j) for j in pending]
+
+    for job in jobs:
+        if job["kind"] == "metrics":
+            pd.Series(job["data"]["metrics"], name=job["name"]).to_csv(
+                os.path.join(out_dir, job["name"], "metrics.csv")
+            )
+    for job in pending:
+        manifest[key(job)] = job["hash"]
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"Relatórios: {len(rendered)} figuras renderizadas, {len(cached)} reaproveitadas do cache ({out_dir})")
+    return {"rendered": rendered, "cached": cached}
+
+
+def generate_report(carteira: pd.Series, perfil: str, **kwargs) -> Dict[str, List[str]]:
+    """Gera o relatório (fronteira, correlação, drawdown e métricas) de uma carteira."""
+    return generate_batch_reports({perfil: carteira}, **kwargs)
@@ -0,0 +1,13 @@
+import pandas as pd
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def random_prices():
+    """Fábrica de preços sintéticos: passeio aleatório multiplicativo a partir de 100 (semente fixa)."""
+    def make(dates, columns, seed=0, mean=0.0, vol=0.03):
+        rng = np.random.default_rng(seed)
+        steps = rng.normal(mean, vol, size=(len(dates), len(columns)))
+        return pd.DataFrame(100 * np.cumprod(1 + steps, axis=0), index=dates, columns=list(columns))
+    return make
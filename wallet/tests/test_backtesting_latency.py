@@ -0,0 +1,32 @@
+import time
+import pandas as pd
+import numpy as np
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.backtests.simulator import PortfolioBacktester
+from src.preprocessing.incremental_stats import update_statistics
+
+# Meta de latência do caminho diário (folgada para máquinas de CI lentas)
+DAILY_RUN_LIMIT_S = 5.0
+
+
+def test_daily_20_year_run_stays_under_latency_target(tmp_path, random_prices):
+    names = ["Renda Fixa Prefixada", "Renda Fixa IPCA+", "Ações Brasil", "Ações Globais",
+             "Dólar", "Ouro", "Bitcoin"]
+    dates = pd.bdate_range("2005-01-03", periods=20 * 252)
+    prices = random_prices(dates, names, seed=7, mean=0.0003, vol=0.01)
+    prices.iloc[:2000, 6] = np.nan   # Bitcoin com início tardio
+    prices_path = tmp_path / "prices_raw.csv"
+    prices.to_csv(prices_path)
+    weights = {n: 1 / 7 for n in names}
+
+    start = time.perf_counter()
+    update_statistics(str(prices_path), str(tmp_path / "processed"))
+    bt = PortfolioBacktester(prices, weights, rebalance=True, rebalance_frequency="M",
+                             rebalance_calendar="B3", transaction_cost=0.001)
+    bt.run()
+    summary = bt.get_metrics().summary()
+    elapsed = time.perf_counter() - start
+
+    assert np.isfinite(summary["Sharpe"])
+    assert elapsed < DAILY_RUN_LIMIT_S, f"execução diária levou {elapsed:.2f}s"
@@ -24,3 +24,68 @@ def test_metrics_basic_values():
 
     # total return positivo
     assert summary["Total Return"] > 0
+
+def test_metrics_with_time_varying_risk_free():
+    from src.backtests.risk_free import RiskFreeRate
+
+    dates = pd.bdate_range("2020-01-01", periods=60)
+    curve = pd.Series(np.cumprod(np.r_[1.0, 1 + np.tile([0.004, -0.001], 30)[:59]]), index=dates)
+    rates = pd.Series([0.0002, 0.0004], index=pd.to_datetime(["2019-12-31", "2020-02-01"]))
+    rf = RiskFreeRate(rates)
+
+    m_zero = PerformanceMetrics(curve)
+    m_cdi = PerformanceMetrics(curve, risk_free=rf)
+
+    # retornos em excesso usam a taxa vigente no início de cada período
+    assert np.isclose(m_cdi.rf_returns.iloc[0], 0.0002)
+    assert np.isclose(m_cdi.rf_returns.loc["2020-02-04"], 0.0004)
+    assert m_cdi.sharpe_ratio() < m_zero.sharpe_ratio()
+
+    # o alinhamento fica em cache para o mesmo índice
+    assert rf.period_returns(curve.index) is rf.period_returns(curve.index)
+    assert len(rf._cache) == 1
+
+
+def test_time_varying_risk_free_on_tz_aware_curve():
+    from src.backtests.risk_free import RiskFreeRate
+
+    naive = pd.bdate_range("2020-01-01", periods=60)
+    aware = naive.tz_localize("America/Sao_Paulo")
+    steps = np.cumprod(np.r_[1.0, 1 + np.tile([0.004, -0.001], 30)[:59]])
+    rates = pd.Series([0.0002, 0.0004], index=pd.to_datetime(["2019-12-31", "2020-02-01"]))
+    rf = RiskFreeRate(rates)
+
+    m_aware = PerformanceMetrics(pd.Series(steps, index=aware), risk_free=rf)
+    m_naive = PerformanceMetrics(pd.Series(steps, index=naive), risk_free=rf)
+    assert m_aware.rf_returns.index.equals(aware[1:])
+    np.testing.assert_allclose(m_aware.rf_returns.to_numpy(), m_naive.rf_returns.to_numpy())
+    assert np.isclose(m_aware.sharpe_ratio(), m_naive.sharpe_ratio())
+
+def test_annualization_follows_data_frequency():
+    from src.preprocessing.frequency import infer_periods_per_year
+
+    assert infer_periods_per_year(pd.bdate_range("2020-01-01", periods=30)) == 252
+    assert infer_periods_per_year(pd.date_range("2020-01-01", periods=30, freq="D")) == 365
+    assert infer_periods_per_year(pd.date_range("2020-01-01", periods=30, freq="MS")) == 12
+
+    # 12 meses a +1% → retorno anualizado = 1.01^12 - 1
+    monthly = pd.Series(1.01 ** np.arange(13), index=pd.date_range("2020-01-01", periods=13, freq="MS"))
+    metrics = PerformanceMetrics(monthly)
+    assert metrics.periods_per_year == 12
+    assert np.isclose(metrics.annualized_return(), 1.01 ** 12 - 1)
+
+
+def test_load_cdi_reloads_when_file_changes(tmp_path):
+    from src.backtests.risk_free import load_cdi
+
+    path = tmp_path / "cdi.csv"
+    pd.DataFrame({"valor": [0.0004]}, index=pd.to_datetime(["2020-01-01"])).rename_axis("data").to_csv(path)
+    first = load_cdi(str(path))
+    assert load_cdi(str(path)) is first
+
+    pd.DataFrame({"valor": [0.0004, 0.0005]},
+                 index=pd.to_datetime(["2020-01-01", "2020-02-01"])).rename_axis("data").to_csv(path)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    second = load_cdi(str(path))
+    assert second is not first
+    assert len(second.rates) == 2
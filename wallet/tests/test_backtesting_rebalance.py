@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import os,sys
+import pytest
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 from src.backtests.rebalance import apply_rebalance
 
@@ -15,3 +16,45 @@ def test_rebalance_triggers_on_drift():
     portfolio_value, log = apply_rebalance(data, weights, threshold=0.05)
     assert isinstance(portfolio_value, pd.Series)
     assert len(log) >= 1, "O drift deve acionar pelo menos um rebalanceamento"
+
+
+def test_rebalance_log_is_columnar_with_dict_view(tmp_path, random_prices):
+    data = random_prices(pd.date_range("2020-01-01", periods=500), ["A", "B"], seed=0)
+    weights = {"A": 0.6, "B": 0.4}
+
+    _, log = apply_rebalance(data, weights, threshold=0.01, frequency=None,
+                             transaction_cost=0.001, portfolio_id=7)
+    assert len(log) > 64  # força o crescimento dos arrays
+
+    first = log[0]
+    assert set(first["weights_before"]) == {"A", "B"}
+    assert first["weights_after"] == weights
+    assert first["portfolio_id"] == 7
+    assert np.isclose(first["cost"], first["capital_before"] * first["turnover"] * 0.001)
+    assert log[-1]["date"] == log.column("date")[-1]
+
+    frame = log.to_frame()
+    assert len(frame) == len(log)
+    np.testing.assert_allclose(frame["before_A"], log.column("weights_before")[:, 0])
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = log.to_parquet(str(tmp_path / "log.parquet"))
+    table = pq.read_table(path)
+    assert table.num_rows == len(log)
+    assert table.column("weights_before").to_pylist()[0] == list(first["weights_before"].values())
+
+
+def test_rebalance_log_keeps_timezone_and_supports_slices(random_prices):
+    dates = pd.date_range("2024-01-01", periods=120, freq="B", tz="America/Sao_Paulo")
+    data = random_prices(dates, ["A", "B"], seed=1, vol=0.02)
+    _, log = apply_rebalance(data, {"A": 0.5, "B": 0.5}, threshold=0.02, frequency="M")
+    assert len(log) >= 3
+
+    assert str(log[0]["date"].tz) == "America/Sao_Paulo"
+    assert log[0]["date"] in dates
+    assert log.dates().equals(pd.DatetimeIndex([e["date"] for e in log]))
+    assert str(log.to_frame()["date"].dt.tz) == "America/Sao_Paulo"
+
+    tail = log[-3:]
+    assert isinstance(tail, list) and len(tail) == 3
+    assert tail[-1] == log[-1]
@@ -0,0 +1,54 @@
+import pandas as pd
+import numpy as np
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.backtests.schedule import rebalance_positions, b3_holidays
+from src.backtests.rebalance import apply_rebalance
+
+
+def test_month_and_quarter_ends_on_b3_calendar():
+    dates = pd.date_range("2024-01-01", "2024-12-31", freq="D")
+
+    month_ends = dates[rebalance_positions(dates, "M", calendar="B3")]
+    # 31/12 não tem pregão e o último período (incompleto) não dispara
+    assert len(month_ends) == 11
+    assert pd.Timestamp("2024-03-28") in month_ends   # 29/03/2024 = Sexta-feira Santa
+    assert pd.Timestamp("2024-08-30") in month_ends   # 31/08/2024 = sábado
+
+    quarter_ends = dates[rebalance_positions(dates, "Q", calendar="B3")]
+    assert list(quarter_ends) == list(pd.to_datetime(["2024-03-28", "2024-06-28", "2024-09-30"]))
+
+    custom = dates[rebalance_positions(dates, ["2024-02-10", "2024-11-20"], calendar="B3")]
+    assert list(custom) == list(pd.to_datetime(["2024-02-14", "2024-11-21"]))  # pós-Carnaval / Consciência Negra
+
+
+def test_b3_holidays_moving_dates():
+    holidays = b3_holidays(2025)
+    assert pd.Timestamp("2025-03-03").date() in holidays   # Carnaval
+    assert pd.Timestamp("2025-06-19").date() in holidays   # Corpus Christi
+
+
+def test_hybrid_trigger_only_rebalances_on_calendar_dates():
+    dates = pd.bdate_range("2020-01-01", periods=60)
+    data = pd.DataFrame({
+        "A": np.linspace(100, 200, 60),
+        "B": np.linspace(100, 50, 60)
+    }, index=dates)
+    weights = {"A": 0.5, "B": 0.5}
+
+    _, band_log = apply_rebalance(data, weights, threshold=0.05, trigger="band")
+    _, hybrid_log = apply_rebalance(data, weights, threshold=0.05, frequency="M", trigger="hybrid")
+    _, cal_log = apply_rebalance(data, weights, threshold=0.05, frequency="M", trigger="calendar")
+
+    month_ends = {pd.Timestamp("2020-01-31"), pd.Timestamp("2020-02-28")}
+    assert len(band_log) > len(hybrid_log) >= 1
+    assert {e["date"] for e in hybrid_log} <= month_ends
+    assert {e["date"] for e in cal_log} == month_ends
+
+
+def test_positions_use_local_dates_on_tz_aware_index():
+    naive = pd.date_range("2024-01-01", "2024-06-30", freq="D")
+    aware = naive.tz_localize("America/Sao_Paulo")
+    for freq in ("M", ["2024-02-10", "2024-05-01"]):
+        expected = rebalance_positions(naive, freq, calendar="B3")
+        np.testing.assert_array_equal(rebalance_positions(aware, freq, calendar="B3"), expected)
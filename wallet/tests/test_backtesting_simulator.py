@@ -29,9 +29,46 @@ def test_simulation_with_rebalance():
     }, index=dates)
     weights = {"A": 0.5, "B": 0.5}
 
-    bt = PortfolioBacktester(data, weights, rebalance=True, rebalance_threshold=0.05)
+    bt = PortfolioBacktester(data, weights, rebalance=True, rebalance_threshold=0.05,
+                             portfolio_id=3)
     curve, log = bt.run()
 
     # deve haver pelo menos um rebalanceamento
     assert len(log) >= 1
     assert "date" in log[0]
+    assert set(log.column("portfolio_id")) == {3}
+
+
+def test_unheld_late_start_column_does_not_drop_rows(random_prices):
+    dates = pd.date_range("2020-01-01", periods=129, freq="B")
+    data = random_prices(dates, ["^BVSP", "^GSPC", "BTC-USD"], seed=2, vol=0.01)
+    data.iloc[:77, 2] = np.nan   # ativo sem peso com início tardio
+    data["BRL=X"] = 5.0          # câmbio constante: retornos em reais = em dólar
+    weights = {"^BVSP": 0.6, "^GSPC": 0.4}
+
+    for rebalance in (False, True):
+        curve, _ = PortfolioBacktester(data, weights, rebalance=rebalance).run()
+        assert len(curve) == len(data) - 1
+        assert curve.index[0] == dates[1]
+
+    # o primeiro retorno entra na curva
+    curve, _ = PortfolioBacktester(data, weights, rebalance=True, rebalance_frequency=None,
+                                   rebalance_threshold=1.0).run()
+    first = data.iloc[1, :2] / data.iloc[0, :2] - 1
+    assert np.isclose(curve.iloc[0], 1 + first @ pd.Series(weights))
+
+    # ativo com peso e início tardio: a curva começa quando todos têm preço
+    late = {"^BVSP": 0.5, "BTC-USD": 0.5}
+    curve, _ = PortfolioBacktester(data, late).run()
+    assert curve.index[0] == dates[78]
+
+
+def test_metrics_count_the_first_period():
+    dates = pd.date_range("2020-01-01", periods=5, freq="B")
+    data = pd.DataFrame({"A": [100, 110, 110, 110, 110], "B": [100, 110, 110, 110, 110]}, index=dates)
+
+    for rebalance in (False, True):
+        bt = PortfolioBacktester(data, {"A": 0.5, "B": 0.5}, rebalance=rebalance)
+        bt.run()
+        assert bt.results.index[0] == dates[0] and bt.results.iloc[0] == 1.0
+        assert np.isclose(bt.get_metrics().total_return(), 0.10)
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import urllib.parse
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.data_collection.bcb_sgs import HTTPTransport, SGSClient, UrllibTransport, fetch_sgs_series, read_cache
+
+
+def _make_server(fail_first: int = 0):
+    """Servidor local que imita a API SGS (série diária com valor 1.0 = 1%)."""
+    state = {"requests": [], "failures": fail_first}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            params = dict(urllib.parse.parse_qsl(parsed.query))
+            state["requests"].append((parsed.path, params))
+
+            if state["failures"] > 0:
+                state["failures"] -= 1
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            start = datetime.strptime(params["dataInicial"], "%d/%m/%Y")
+            end = datetime.strptime(params["dataFinal"], "%d/%m/%Y")
+            days = pd.bdate_range(start, end)
+            if len(days) == 0:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps([{"data": d.strftime("%d/%m/%Y"), "valor": "1.0"} for d in days])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/bcdata.sgs.{{code}}/dados"
+    return server, base_url, state
+
+
+def test_fetch_many_series_and_incremental_cache(tmp_path):
+    server, base_url, state = _make_server()
+    try:
+        series = {"CDI": 12, "SELIC": 11}
+        df = fetch_sgs_series(series, start="2024-01-01", end="2024-01-31",
+                              cache_dir=str(tmp_path), base_url=base_url)
+        assert list(df.columns) == ["CDI", "SELIC"]
+        assert len(df) == len(pd.bdate_range("2024-01-01", "2024-01-31"))
+        # séries percentuais são convertidas para decimal
+        assert df["CDI"].iloc[0] == 0.01
+
+        # segunda chamada só busca o intervalo novo
+        n_before = len(state["requests"])
+        fetch_sgs_series({"CDI": 12}, start="2024-01-01", end="2024-02-29",
+                         cache_dir=str(tmp_path), base_url=base_url)
+        new_requests = state["requests"][n_before:]
+        assert len(new_requests) == 1
+        assert new_requests[0][1]["dataInicial"] == "01/02/2024"
+
+        cached = read_cache("CDI", str(tmp_path))
+        assert cached.index.max() == pd.Timestamp("2024-02-29")
+
+        # início em dia sem publicação (feriado/fim de semana) não é consultado de novo
+        n_before = len(state["requests"])
+        fetch_sgs_series({"CDI": 12}, start="2023-12-30", end="2024-02-29",
+                         cache_dir=str(tmp_path), base_url=base_url)
+        assert len(state["requests"]) == n_before + 1
+        fetch_sgs_series({"CDI": 12}, start="2023-12-30", end="2024-02-29",
+                         cache_dir=str(tmp_path), base_url=base_url)
+        assert len(state["requests"]) == n_before + 1
+    finally:
+        server.shutdown()
+
+
+def test_retries_on_server_error(tmp_path):
+    server, base_url, state = _make_server(fail_first=2)
+    try:
+        client = SGSClient(transport=UrllibTransport(), retries=3, backoff=0.01,
+                           cache_dir=str(tmp_path), base_url=base_url)
+        s = asyncio.run(client.fetch_series("PTAX", 1, "2024-01-01", "2024-01-05"))
+        assert len(s) == 5
+        # PTAX não é percentual
+        assert s.iloc[0] == 1.0
+        assert len(state["requests"]) == 3
+    finally:
+        server.shutdown()
+
+
+def test_transport_without_get_json_fails_on_creation():
+    class Incomplete(HTTPTransport):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,37 @@
+import json
+import logging
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.monitoring.logging_config import configure_logging, shutdown_logging, log_event
+
+
+def test_structured_events_are_written_as_json_with_rotation(tmp_path):
+    path = tmp_path / "monitoring.log"
+    listener = configure_logging(str(path), max_bytes=2000, backup_count=2)
+    try:
+        # chamadas repetidas não reconfiguram
+        assert configure_logging(str(tmp_path / "outro.log")) is listener
+
+        logger = logging.getLogger("src.monitoring.drift_checker")
+        # logs de bibliotecas externas não vão para o arquivo de monitoramento
+        logging.getLogger("aiohttp.client").warning("fora do monitoramento")
+        for i in range(50):
+            log_event(logger, "drift_check", logging.WARNING, portfolio_id=f"cliente_{i}",
+                      max_drift=0.07, threshold=0.05, elapsed_ms=1.5)
+    finally:
+        shutdown_logging()
+
+    assert not (tmp_path / "outro.log").exists()
+    assert (tmp_path / "monitoring.log.1").exists()
+    assert not (tmp_path / "monitoring.log.3").exists()
+
+    last = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+    assert last["event"] == "drift_check"
+    assert last["level"] == "WARNING"
+    assert last["portfolio_id"] == "cliente_49"
+    assert last["max_drift"] == 0.07
+    lines = path.read_text(encoding="utf-8")
+    lines += "".join((tmp_path / f"monitoring.log.{i}").read_text(encoding="utf-8") for i in (1, 2)
+                     if (tmp_path / f"monitoring.log.{i}").exists())
+    assert "fora do monitoramento" not in lines
+    assert logging.getLogger("src.monitoring").propagate
@@ -0,0 +1,41 @@
+import pandas as pd
+import numpy as np
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.preprocessing.alignment import align_prices, load_aligned_prices
+
+
+def _raw_prices():
+    dates = pd.date_range("2020-01-31", periods=6, freq="ME")
+    return pd.DataFrame({
+        "^BVSP": [100, 110, np.nan, 121, 0, 133.1],
+        "IMAB11.SA": [np.nan, np.nan, 50, 55, 60.5, 66.55],   # início tardio
+    }, index=dates)
+
+
+def test_late_start_is_kept_and_never_backfilled():
+    panel = align_prices(_raw_prices())
+
+    assert panel.assets == ["^BVSP", "IMAB11.SA"]
+    # sem preço futuro antes da primeira cotação
+    assert panel.prices["IMAB11.SA"].iloc[:2].isna().all()
+    assert not panel.available["IMAB11.SA"].iloc[:2].any()
+    assert panel.first_valid["IMAB11.SA"] == pd.Timestamp("2020-03-31")
+
+    returns = panel.returns()
+    assert returns["IMAB11.SA"].iloc[:3].isna().all()
+    np.testing.assert_allclose(returns["IMAB11.SA"].iloc[3:], 0.1)
+    # lacuna e preço zero repetem o último preço (retorno 0 no período)
+    assert returns["^BVSP"].iloc[2] == 0.0
+    assert returns["^BVSP"].iloc[4] == 0.0
+
+
+def test_max_gap_and_file_cache(tmp_path):
+    panel = align_prices(_raw_prices(), max_gap=0)
+    assert not panel.available["^BVSP"].iloc[2]
+    assert np.isnan(panel.returns()["^BVSP"].iloc[3])
+
+    path = tmp_path / "prices_raw.csv"
+    _raw_prices().to_csv(path)
+    first = load_aligned_prices(str(path))
+    assert load_aligned_prices(str(path)) is first
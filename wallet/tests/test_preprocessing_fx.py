@@ -0,0 +1,57 @@
+import pandas as pd
+import numpy as np
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.preprocessing.fx import to_brl
+from src.preprocessing.alignment import align_prices, load_aligned_prices
+from src.backtests.simulator import PortfolioBacktester
+
+
+def _raw_prices():
+    dates = pd.date_range("2020-01-31", periods=4, freq="ME")
+    return pd.DataFrame({
+        "^BVSP": [100.0, 110.0, 121.0, 133.1],
+        "^GSPC": [10.0, 10.0, 10.0, 11.0],
+        "BRL=X": [np.nan, 5.0, 5.5, 5.5],
+    }, index=dates)
+
+
+def test_usd_assets_converted_with_same_date_fx():
+    brl = to_brl(_raw_prices())
+    np.testing.assert_allclose(brl["^GSPC"].iloc[1:], [50.0, 55.0, 60.5])
+    # ativos em BRL e o próprio câmbio não mudam
+    pd.testing.assert_series_equal(brl["^BVSP"], _raw_prices()["^BVSP"])
+    pd.testing.assert_series_equal(brl["BRL=X"], _raw_prices()["BRL=X"])
+
+
+def test_panel_in_brl_masks_dates_without_fx(tmp_path):
+    panel = align_prices(_raw_prices()).to_brl()
+    assert not panel.available["^GSPC"].iloc[0]
+    assert panel.available["^BVSP"].iloc[0]
+
+    returns = panel.returns()
+    assert np.isnan(returns["^GSPC"].iloc[1])
+    # retorno em reais = variação do ativo em dólar composta com a do câmbio
+    np.testing.assert_allclose(returns["^GSPC"].iloc[2:], [0.1, 0.1])
+
+    path = tmp_path / "prices_raw.csv"
+    _raw_prices().to_csv(path)
+    cached = load_aligned_prices(str(path), base_currency="BRL")
+    assert load_aligned_prices(str(path), base_currency="BRL") is cached
+    assert load_aligned_prices(str(path)).prices["^GSPC"].iloc[-1] == 11.0
+
+
+def test_backtester_defaults_to_brl_without_double_conversion():
+    weights = {"^BVSP": 0.5, "^GSPC": 0.5}
+    curve, _ = PortfolioBacktester(_raw_prices(), weights).run()
+    # ^GSPC só entra quando há câmbio; em reais sobe 10% nos dois últimos meses
+    assert curve.index[0] == _raw_prices().index[2]
+    np.testing.assert_allclose(curve.pct_change().iloc[1:], [0.1])
+
+    panel = align_prices(_raw_prices()).to_brl()
+    assert panel.to_brl() is panel
+    again, _ = PortfolioBacktester(panel, weights).run()
+    pd.testing.assert_series_equal(again, curve)
+
+    usd, _ = PortfolioBacktester(_raw_prices(), weights, base_currency=None).run()
+    assert usd.index[0] == _raw_prices().index[1]
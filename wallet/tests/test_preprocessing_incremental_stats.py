@@ -0,0 +1,106 @@
+import pandas as pd
+import numpy as np
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.preprocessing.incremental_stats import IncrementalStats, update_statistics
+
+
+def _returns():
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2015-01-31", periods=120, freq="ME")
+    data = pd.DataFrame(rng.normal(0.01, 0.05, size=(120, 4)), index=dates, columns=list("ABCD"))
+    data.iloc[:40, 2] = np.nan   # início tardio
+    data.iloc[70, 3] = np.nan    # lacuna
+    return data
+
+
+def test_incremental_update_matches_full_recompute(tmp_path):
+    returns = _returns()
+    state = IncrementalStats.from_returns(returns.iloc[:100])
+    state.update(returns.iloc[100:110]).update(returns.iloc[110:])
+
+    np.testing.assert_allclose(state.mean(), returns.mean(), rtol=1e-10)
+    np.testing.assert_allclose(state.std(), returns.std(), rtol=1e-10)
+    np.testing.assert_allclose(state.corr(), returns.corr(), rtol=1e-9, atol=1e-12)
+
+    restored = IncrementalStats.load(state.save(str(tmp_path / "state.npz")))
+    assert restored.last_date == returns.index[-1]
+    np.testing.assert_allclose(restored.corr(), state.corr())
+
+
+def test_update_statistics_appends_only_new_rows(tmp_path, random_prices):
+    dates = pd.date_range("2015-01-01", periods=40, freq="MS")
+    prices = random_prices(dates, ["^BVSP", "IMAB11.SA"], seed=2)
+    prices_path = tmp_path / "prices_raw.csv"
+    out = tmp_path / "processed"
+
+    prices.iloc[:30].to_csv(prices_path)
+    update_statistics(str(prices_path), str(out), verify=True)
+
+    prices.to_csv(prices_path)
+    returns, stats, corr = update_statistics(str(prices_path), str(out), verify=True)
+
+    saved = pd.read_csv(out / "returns.csv", index_col=0, parse_dates=True)
+    assert len(saved) == len(returns) == 39
+    np.testing.assert_allclose(saved.to_numpy(), returns.to_numpy())
+
+
+def test_update_statistics_rebuilds_when_folded_rows_are_revised(tmp_path, random_prices):
+    dates = pd.date_range("2015-01-01", periods=40, freq="MS")
+    prices = random_prices(dates, ["^BVSP", "IMAB11.SA"], seed=4)
+    prices_path = tmp_path / "prices_raw.csv"
+    out = tmp_path / "processed"
+
+    # última barra parcial, corrigida na execução seguinte junto com datas novas
+    partial = prices.iloc[:30].copy()
+    partial.iloc[-1] *= 0.97
+    partial.to_csv(prices_path)
+    update_statistics(str(prices_path), str(out))
+
+    prices.to_csv(prices_path)
+    returns, stats, corr = update_statistics(str(prices_path), str(out))
+
+    expected = prices.pct_change().iloc[1:]
+    saved = pd.read_csv(out / "returns.csv", index_col=0, parse_dates=True)
+    assert not saved.index.duplicated().any()
+    np.testing.assert_allclose(saved.to_numpy(), expected.to_numpy())
+    np.testing.assert_allclose(corr.to_numpy(), expected.corr().to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(stats["Volatilidade"], expected.std() * np.sqrt(12), rtol=1e-9)
+
+
+def test_update_statistics_rebuilds_state_when_verification_fails(tmp_path, random_prices):
+    dates = pd.date_range("2015-01-01", periods=40, freq="MS")
+    prices = random_prices(dates, ["^BVSP", "IMAB11.SA"], seed=5)
+    prices_path = tmp_path / "prices_raw.csv"
+    out = tmp_path / "processed"
+
+    prices.iloc[:30].to_csv(prices_path)
+    update_statistics(str(prices_path), str(out))
+
+    # estado corrompido nos produtos cruzados (somas por ativo intactas)
+    state = IncrementalStats.load(str(out / "stats_state.npz"))
+    state.cross[0, 1] = state.cross[1, 0] = state.cross[0, 1] + 0.5
+    state.save(str(out / "stats_state.npz"))
+
+    prices.to_csv(prices_path)
+    returns, _, corr = update_statistics(str(prices_path), str(out), verify=True)
+
+    np.testing.assert_allclose(corr.to_numpy(), returns.corr().to_numpy(), rtol=1e-9)
+    saved = pd.read_csv(out / "returns.csv", index_col=0, parse_dates=True)
+    assert len(saved) == len(returns) == 39
+
+
+def test_update_statistics_two_passes_on_tz_aware_bars(tmp_path, random_prices):
+    dates = pd.date_range("2024-03-01 10:00", periods=200, freq="h", tz="America/Sao_Paulo")
+    prices = random_prices(dates, ["^BVSP", "IMAB11.SA"], seed=6, vol=0.005)
+    prices_path = tmp_path / "prices_raw.csv"
+    out = tmp_path / "processed"
+
+    prices.iloc[:150].to_csv(prices_path)
+    update_statistics(str(prices_path), str(out))
+    assert IncrementalStats.load(str(out / "stats_state.npz")).last_date == dates[149]
+
+    prices.to_csv(prices_path)
+    returns, _, corr = update_statistics(str(prices_path), str(out), verify=True)
+    assert len(returns) == 199
+    np.testing.assert_allclose(corr.to_numpy(), returns.corr().to_numpy(), rtol=1e-9)
@@ -0,0 +1,71 @@
+import pandas as pd
+import numpy as np
+import pytest
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+pytest.importorskip("matplotlib")
+from src.preprocessing.alignment import align_prices
+from src.visualization.reports import build_jobs, generate_batch_reports
+
+
+@pytest.fixture
+def inputs(random_prices):
+    dates = pd.date_range("2018-01-01", periods=48, freq="MS")
+    prices = random_prices(dates, ["^BVSP", "IMAB11.SA", "IRFM11.SA"], seed=3, mean=0.005, vol=0.04)
+    panel = align_prices(prices)
+    returns = panel.returns()
+    stats = pd.DataFrame({"Retorno_Esperado": returns.mean() * 12,
+                          "Volatilidade": returns.std() * np.sqrt(12)})
+    return {"stats": stats, "corr": returns.corr(), "panel": panel, "risk_free": 0.0}
+
+
+def test_batch_reports_rerender_only_changed_inputs(tmp_path, inputs):
+    portfolios = {
+        "Conservador": pd.Series({"IMAB11.SA": 0.7, "IRFM11.SA": 0.3}),
+        "Arrojado": pd.Series({"^BVSP": 0.8, "IMAB11.SA": 0.2}),
+    }
+
+    first = generate_batch_reports(portfolios, out_dir=str(tmp_path), inputs=inputs, max_workers=2)
+    assert len(first["rendered"]) == 7   # correlação + 3 figuras por carteira
+    assert all(os.path.exists(p) for p in first["rendered"])
+    assert os.path.exists(tmp_path / "Arrojado" / "metrics.csv")
+
+    second = generate_batch_reports(portfolios, out_dir=str(tmp_path), inputs=inputs)
+    assert second["rendered"] == [] and len(second["cached"]) == 7
+
+    portfolios["Arrojado"] = pd.Series({"^BVSP": 0.5, "IMAB11.SA": 0.5})
+    third = generate_batch_reports(portfolios, out_dir=str(tmp_path), inputs=inputs)
+    assert sorted(os.path.relpath(p, tmp_path) for p in third["rendered"]) == [
+        os.path.join("Arrojado", k + ".png") for k in ("drawdown", "frontier", "metrics")
+    ]
+
+
+def test_equity_starts_when_all_held_assets_have_prices(inputs):
+    prices = inputs["panel"].prices.copy()
+    prices.iloc[:20, prices.columns.get_loc("IRFM11.SA")] = np.nan   # início tardio
+    inputs["panel"] = align_prices(prices)
+
+    jobs = build_jobs({"Conservador": pd.Series({"IRFM11.SA": 0.7, "IMAB11.SA": 0.3, "^BVSP": 0.0})},
+                      inputs, out_dir="unused")
+    drawdown = next(j for j in jobs if j["kind"] == "drawdown")["data"]
+    assert drawdown["dates"][0] == prices.index[20]
+    assert drawdown["equity"][0] == 1.0
+    assert len(drawdown["equity"]) == len(prices) - 20
+
+
+def test_frontier_points_are_real_portfolios_up_to_the_best_asset():
+    from src.visualization.reports import efficient_frontier
+
+    mu = np.array([0.08, 0.12, 0.90])
+    vol = np.array([0.05, 0.20, 0.72])
+    corr = np.array([[1.0, 0.2, 0.0], [0.2, 1.0, 0.3], [0.0, 0.3, 1.0]])
+    sigma = np.diag(vol) @ corr @ np.diag(vol)
+
+    frontier, exact = efficient_frontier(mu, sigma)
+    fx, fy = map(np.array, zip(*frontier))
+    tol = 1e-3 if exact else 1e-12
+    # chega ao canto do ativo de maior retorno e nunca piora o retorno ao subir o risco
+    assert np.isclose(fx[-1], 0.72, rtol=tol) and np.isclose(fy[-1], 0.90, rtol=tol)
+    assert np.all(np.diff(fy) >= -tol)
+    # começa perto da carteira de menor risco (abaixo do ativo menos volátil)
+    assert fx[0] <= 0.05 + tol